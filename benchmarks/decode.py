@@ -0,0 +1,67 @@
+import json
+import timeit
+import tracemalloc
+
+from bot.core import models
+from bot.core.models import Ads, DailyRewards, Quest, Upgrades, User, decode
+
+
+QUESTS = 60
+
+user_body = json.dumps({
+    'id': 123456789,
+    'balance': '1234567.891',
+    'limitDate': '2024-06-01T12:00:00.000Z',
+    'referrals': 12,
+    'quests': [{'name': f'quest_{i}', 'status': 'completed', 'updatedAt': '2024-06-01T12:00:00.000Z'}
+               for i in range(QUESTS)],
+}).encode()
+quests_body = json.dumps([
+    {'name': f'quest_{i}', 'checkType': 'timer', 'reward': '5000', 'link': f'https://t.me/channel_{i}'}
+    for i in range(QUESTS)
+]).encode()
+upgrades_body = json.dumps({
+    upgrade_type: [{'level': 3, 'price': '25000', 'value': 10}, {'level': 4, 'price': '50000', 'value': 12}]
+    for upgrade_type in ('tapPower', 'tapDuration', 'tapCoolDown')
+}).encode()
+ads_body = json.dumps({'available': 3, 'watched': 2}).encode()
+rewards_body = json.dumps({'current': '2', 'rewards': [500 * i for i in range(1, 11)]}).encode()
+
+# Roughly what one cycle of the original Tapper.run fetched: /user after every claim, ad and upgrade step.
+CYCLE = [(user_body, User)] * 10 + [(quests_body, list[Quest]), (upgrades_body, Upgrades),
+                                    (ads_body, Ads), (rewards_body, DailyRewards)]
+
+
+def cycle_stdlib() -> None:
+    for body, _ in CYCLE:
+        json.loads(body.decode())
+
+
+def cycle_typed() -> None:
+    for body, tp in CYCLE:
+        decode(body, tp)
+
+
+def measure(func, number: int = 2000) -> tuple[float, int]:
+    func()
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return seconds, peak
+
+
+def main() -> None:
+    backend = 'msgspec' if models.msgspec else 'orjson' if models.orjson else 'json'
+    print(f"Typed decoder backend: {backend}")
+
+    for name, func in (('stdlib json -> dict', cycle_stdlib), (f'{backend} -> typed', cycle_typed)):
+        seconds, peak = measure(func)
+        print(f"{name:<22} {seconds * 1e6:9.1f} us/cycle   peak alloc {peak / 1024:8.1f} KiB/cycle")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import resource
+import tempfile
+from statistics import quantiles
+
+os.environ.setdefault('API_ID', '1')
+os.environ.setdefault('API_HASH', 'benchmark')
+
+from bot.utils import logger
+from bot.config import settings
+from bot.core.api import connector_pool
+from bot.core.scheduler import Scheduler
+from bot.core.state import state_store
+from bot.core.tapper import Tapper
+from bot.core import web_data_cache
+from bot.utils.loop_lag import LoopLagMonitor
+from bot.utils.profiler import profiler
+
+from .mock_api import MockConfig, MockDiamoreApi
+
+
+class BenchmarkTapper(Tapper):
+    __slots__ = ()
+
+    cycle_times: list[float] = []
+    ready_at: list[float] = []
+    auth_latency = 0.0
+
+    async def request_tg_web_data(self, proxy: str | None) -> str:
+        await asyncio.sleep(self.auth_latency)
+        tg_web_data = f'query_id={self.session_name}&auth_date={int(time.time())}&hash=benchmark'
+        web_data_cache.store(self.session_name, tg_web_data)
+        return tg_web_data
+
+    async def setup(self) -> None:
+        await super().setup()
+        self.ready_at.append(time.perf_counter())
+
+    async def run_cycle(self) -> float:
+        started = time.perf_counter()
+        try:
+            return await super().run_cycle()
+        finally:
+            self.cycle_times.append(time.perf_counter() - started)
+
+
+def prepare_workdir() -> str:
+    workdir = tempfile.mkdtemp()
+    state_store.path = os.path.join(workdir, 'state.sqlite3')
+    web_data_cache.CACHE_DIR = os.path.join(workdir, 'web_data')
+    return workdir
+
+
+def percentile(values: list[float], pct: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return quantiles(values, n=100, method='inclusive')[pct - 1]
+
+
+async def benchmark(args: argparse.Namespace) -> dict:
+    mock = MockDiamoreApi(MockConfig(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                                     cooldown=args.cooldown, ads=args.ads, token_ttl=args.token_ttl))
+    settings.API_URL = await mock.start()
+    prepare_workdir()
+    BenchmarkTapper.auth_latency = args.auth_latency
+
+    if args.profile:
+        profiler.install()
+
+    tappers = [BenchmarkTapper(session_name=f'bench_{i}') for i in range(args.accounts)]
+    monitor = LoopLagMonitor()
+    monitor.start()
+
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(Scheduler(workers=args.workers).run(tappers=tappers), timeout=args.duration)
+    except asyncio.TimeoutError:
+        pass
+    elapsed = time.perf_counter() - started
+
+    await monitor.stop()
+    if args.profile:
+        profiler.dump(args.profile)
+    await connector_pool.close()
+    await mock.stop()
+    state_store.close()
+
+    cycles = BenchmarkTapper.cycle_times
+    return {
+        'accounts': args.accounts,
+        'duration': round(elapsed, 2),
+        'authenticated': len(BenchmarkTapper.ready_at),
+        'startup_secs': round(max(BenchmarkTapper.ready_at, default=started) - started, 2),
+        'requests': mock.total_requests,
+        'requests_per_sec': round(mock.total_requests / elapsed, 1),
+        'server_errors': mock.errors,
+        'unauthorized': mock.unauthorized,
+        'cycles': len(cycles),
+        'cycle_p50': round(percentile(cycles, 50), 3),
+        'cycle_p95': round(percentile(cycles, 95), 3),
+        'cycle_p99': round(percentile(cycles, 99), 3),
+        'loop_lag_p99': round(percentile(monitor.samples, 99), 4),
+        'loop_lag_max': round(monitor.max_lag, 4),
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run simulated accounts against a local mock api.diamore.co")
+    parser.add_argument("--accounts", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run")
+    parser.add_argument("--workers", type=int, default=settings.MAX_CONCURRENT_CYCLES)
+    parser.add_argument("--latency", type=float, default=0.05, help="Mean mock response latency, sec")
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 500")
+    parser.add_argument("--cooldown", type=float, default=5, help="Game cooldown after a tap claim, sec")
+    parser.add_argument("--ads", type=int, default=1, help="Ads available per account")
+    parser.add_argument("--rate-limit", type=float, default=settings.RATE_LIMIT_HOST,
+                        help="Requests/sec allowed to the API, 0 disables the limiter")
+    parser.add_argument("--auth-latency", type=float, default=0.5, help="Simulated Telegram login time, sec")
+    parser.add_argument("--auth-stagger", type=float, default=settings.TG_AUTH_STAGGER,
+                        help="Delay between starting Telegram logins, sec")
+    parser.add_argument("--token-ttl", type=float, default=0,
+                        help="Reject auth data older than this with 401, sec, 0 - never")
+    parser.add_argument("--profile", metavar="PATH", help="Write per-coroutine timings to PATH")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--verbose", action="store_true", help="Keep the bot's own log output")
+    parser.add_argument("--min-rps", type=float, help="Fail if requests/sec drops below this")
+    parser.add_argument("--max-p95", type=float, help="Fail if p95 cycle latency exceeds this, sec")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logger.remove()
+
+    settings.RATE_LIMIT_HOST = args.rate_limit
+    settings.TG_AUTH_STAGGER = args.auth_stagger
+
+    report = asyncio.run(benchmark(args))
+
+    if args.json:
+        print(json.dumps(report))
+    else:
+        for key, value in report.items():
+            print(f"{key:<18} {value}")
+
+    failed = []
+    if args.min_rps is not None and report['requests_per_sec'] < args.min_rps:
+        failed.append(f"requests/sec {report['requests_per_sec']} < {args.min_rps}")
+    if args.max_p95 is not None and report['cycle_p95'] > args.max_p95:
+        failed.append(f"cycle p95 {report['cycle_p95']}s > {args.max_p95}s")
+
+    if failed:
+        print("FAILED: " + "; ".join(failed), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
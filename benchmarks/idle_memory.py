@@ -0,0 +1,118 @@
+"""Memory held per sleeping account.
+
+Target: an account waiting for its next cycle keeps at most 2 KiB of Python heap, i.e. its Tapper, its
+AccountState and its metrics entries. HTTP sessions, cookies and sockets are only held while a cycle runs.
+
+Two fleets are measured and the per-account figure is the slope between them, so fixed scheduler and metrics
+overhead is not spread over the accounts and the result does not depend on the fleet size. The mock game cooldown
+outlasts the run, so every account plays exactly one cycle, and the heap is only sampled once all of them have
+finished it and no worker is busy.
+"""
+import gc
+import sys
+import asyncio
+import argparse
+import multiprocessing
+import tracemalloc
+
+from .fleet import BenchmarkTapper, prepare_workdir
+
+from bot.utils import logger
+from bot.config import settings
+from bot.core.api import connector_pool
+from bot.core.scheduler import Scheduler
+
+from .mock_api import MockConfig, serve
+
+
+TARGET_BYTES = 2048
+COOLDOWN = 86400
+
+
+async def wait_idle(scheduler: Scheduler, tappers: list[BenchmarkTapper]) -> None:
+    while not all(tapper.state.next_wake for tapper in tappers):
+        await asyncio.sleep(0.1)
+    # The last cycles may still hold their sessions, wait until the workers have handed every account back
+    await scheduler._ready.join()
+
+
+async def held_by_fleet(name: str, accounts: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    tappers = [BenchmarkTapper(session_name=f'{name}_{i}') for i in range(accounts)]
+
+    scheduler = Scheduler(workers=settings.MAX_CONCURRENT_CYCLES)
+    runner = asyncio.create_task(scheduler.run(tappers=tappers))
+    await wait_idle(scheduler, tappers)
+    await connector_pool.close()
+
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    runner.cancel()
+    await asyncio.gather(runner, return_exceptions=True)
+    await connector_pool.close()
+
+    return held
+
+
+async def measure(accounts: int) -> dict:
+    prepare_workdir()
+
+    warmup = [BenchmarkTapper(session_name='warmup')]
+    scheduler = Scheduler(workers=settings.MAX_CONCURRENT_CYCLES)
+    runner = asyncio.create_task(scheduler.run(tappers=warmup))
+    await wait_idle(scheduler, warmup)
+    runner.cancel()
+    await asyncio.gather(runner, return_exceptions=True)
+    await connector_pool.close()
+
+    small = accounts // 2
+    held_small = await held_by_fleet('small', small)
+    held_large = await held_by_fleet('large', accounts)
+    per_account = (held_large - held_small) // (accounts - small)
+
+    return {
+        'accounts': f'{small} / {accounts}',
+        'held_kib': f'{round(held_small / 1024, 1)} / {round(held_large / 1024, 1)}',
+        'fixed_kib': round((held_small - per_account * small) / 1024, 1),
+        'bytes_per_account': per_account,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure memory held per sleeping account")
+    parser.add_argument("--accounts", type=int, default=1000, help="Size of the larger fleet, the smaller is half")
+    parser.add_argument("--max-bytes", type=int, default=TARGET_BYTES, help="Fail above this many bytes per account")
+    args = parser.parse_args()
+    if args.accounts < 2:
+        parser.error("--accounts must be at least 2")
+
+    logger.remove()
+    settings.RATE_LIMIT_HOST = 0
+    settings.TG_AUTH_STAGGER = 0
+
+    parent, child = multiprocessing.Pipe()
+    config = MockConfig(latency=0.01, jitter=0, cooldown=COOLDOWN)
+    server = multiprocessing.get_context('spawn').Process(target=serve, args=(config, child), daemon=True)
+    server.start()
+    settings.API_URL = parent.recv()
+
+    try:
+        report = asyncio.run(measure(args.accounts))
+    finally:
+        server.terminate()
+
+    for key, value in report.items():
+        print(f"{key:<18} {value}")
+
+    if report['bytes_per_account'] > args.max_bytes:
+        print(f"FAILED: {report['bytes_per_account']} bytes per idle account > {args.max_bytes}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Import time of the CLI entry point.
+
+Target: `main.py --help` imports in under 250 ms and never loads the clicker stack. Arguments are parsed before the
+launcher is imported, so --help also skips pydantic-settings and loguru. Pyrogram, aiocfscrape (with Js2Py) and
+aiohttp_proxy are only imported by the code paths that need them.
+
+`import bot.utils.launcher`, the start of every action, is checked as well: it may load settings and the logger,
+but not the clicker stack, and stays under 500 ms.
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+
+TARGET_MS = 250
+LAUNCHER_TARGET_MS = 500
+CLICKER = ('pyrogram', 'aiocfscrape', 'js2py', 'aiohttp', 'aiohttp_proxy', 'pytz')
+DEFERRED = CLICKER + ('pydantic_settings', 'loguru')
+
+
+def import_times(command: list[str]) -> dict[str, tuple[int, int]]:
+    env = {**os.environ, 'API_ID': os.environ.get('API_ID', '1'), 'API_HASH': os.environ.get('API_HASH', 'benchmark')}
+    result = subprocess.run([sys.executable, '-X', 'importtime', *command], env=env, capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if result.returncode != 0:
+        # A crash during import would otherwise be reported as a fast start
+        print(result.stderr.splitlines()[-1] if result.stderr else '', file=sys.stderr)
+        print(f"FAILED: {' '.join(command)} exited with {result.returncode}", file=sys.stderr)
+        sys.exit(1)
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix('import time:').split('|')
+        # Nested imports are indented by two spaces per level after the separator
+        times[name[1:].rstrip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def measure(command: list[str], runs: int) -> tuple[int, dict[str, int], set[str]]:
+    best = None
+    for _ in range(runs):
+        times = import_times(command)
+        top_level = {name.strip(): cumulative for name, (_, cumulative) in times.items() if not name.startswith('  ')}
+        total = sum(top_level.values())
+        if best is None or total < best[0]:
+            best = total, top_level, {name.strip() for name in times}
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure import time of the CLI entry point")
+    parser.add_argument("--runs", type=int, default=5, help="Take the fastest of this many runs")
+    parser.add_argument("--max-ms", type=float, default=TARGET_MS, help="Fail if --help imports take longer")
+    parser.add_argument("--max-launcher-ms", type=float, default=LAUNCHER_TARGET_MS,
+                        help="Fail if importing the launcher takes longer")
+    parser.add_argument("--top", type=int, default=10, help="Show this many slowest top-level imports")
+    args = parser.parse_args()
+
+    checks = [
+        ('main.py --help', ['main.py', '--help'], args.max_ms, DEFERRED),
+        ('import bot.utils.launcher', ['-c', 'import bot.utils.launcher'], args.max_launcher_ms, CLICKER),
+    ]
+
+    failures = []
+    for label, command, max_ms, deferred in checks:
+        total, top_level, loaded = measure(command, args.runs)
+
+        print(label)
+        print(f"  {'total_ms':<24} {total / 1000:.1f}")
+        for name, cumulative in sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+            print(f"  {name:<24} {cumulative / 1000:.1f}")
+
+        if total / 1000 > max_ms:
+            failures.append(f"{label}: imports took {total / 1000:.1f} ms > {max_ms} ms")
+        imported = [module for module in deferred if module in loaded]
+        if imported:
+            failures.append(f"{label}: imported at startup: {', '.join(imported)}")
+
+    if failures:
+        print(f"FAILED: {'; '.join(failures)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+import time
+import asyncio
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs
+
+from aiohttp import web
+
+
+@dataclass
+class MockConfig:
+    latency: float = 0.05
+    jitter: float = 0.02
+    error_rate: float = 0.0
+    cooldown: float = 5.0
+    ads: int = 1
+    quests: int = 10
+    balance: float = 10_000
+    token_ttl: float = 0
+
+
+@dataclass
+class MockAccount:
+    balance: float
+    ads: int
+    limit_date: datetime | None = None
+    daily_claimed: bool = False
+    completed_quests: set[str] = field(default_factory=set)
+    levels: dict[str, int] = field(default_factory=lambda: {'tapPower': 1, 'tapDuration': 1, 'tapCoolDown': 1})
+
+
+def _iso(moment: datetime) -> str:
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.') + f'{moment.microsecond // 1000:03d}Z'
+
+
+def _price(level: int) -> int:
+    return 1000 * 2 ** (level - 1)
+
+
+class MockDiamoreApi:
+    def __init__(self, config: MockConfig | None = None):
+        self.config = config or MockConfig()
+        self.accounts: dict[str, MockAccount] = {}
+        self.requests: Counter[str] = Counter()
+        self.errors = 0
+        self.unauthorized = 0
+        self.app = web.Application(middlewares=[self._middleware])
+        self._runner: web.AppRunner | None = None
+        self.url = ''
+
+        routes = self.app.router
+        routes.add_get('/user', self.user)
+        routes.add_post('/user/visit', self.visit)
+        routes.add_get('/daily/rewards', self.daily_rewards)
+        routes.add_post('/daily/claim', self.daily_claim)
+        routes.add_get('/quests', self.quests)
+        routes.add_post('/quests/finish', self.finish_quest)
+        routes.add_post('/taps/claim', self.taps_claim)
+        routes.add_get('/ads', self.ads)
+        routes.add_post('/ads/watch', self.watch_ad)
+        routes.add_get('/upgrades', self.upgrades)
+        routes.add_post('/upgrades/buy', self.buy_upgrade)
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f'http://{host}:{port}'
+        return self.url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        self.requests[request.path] += 1
+
+        config = self.config
+        if config.latency or config.jitter:
+            await asyncio.sleep(max(0.0, random.gauss(config.latency, config.jitter)))
+
+        if not self._authorized(request.headers.get('Authorization', '')):
+            self.unauthorized += 1
+            return web.json_response({'message': 'Unauthorized'}, status=401)
+
+        if config.error_rate and random.random() < config.error_rate:
+            self.errors += 1
+            return web.json_response({'message': 'Internal server error'}, status=500)
+
+        return await handler(request)
+
+    def _authorized(self, authorization: str) -> bool:
+        if not authorization.startswith('Token '):
+            return False
+        if not self.config.token_ttl:
+            return True
+        auth_date = parse_qs(authorization[6:]).get('auth_date', ['0'])[0]
+        return auth_date.isdigit() and time.time() - int(auth_date) < self.config.token_ttl
+
+    def _account(self, request: web.Request) -> MockAccount:
+        token = request.headers['Authorization'][6:]
+        key = parse_qs(token).get('query_id', [token])[0]
+        account = self.accounts.get(key)
+        if account is None:
+            account = self.accounts[key] = MockAccount(balance=self.config.balance, ads=self.config.ads)
+        return account
+
+    async def user(self, request: web.Request) -> web.Response:
+        account = self._account(request)
+        return web.json_response({
+            'balance': f'{account.balance:.3f}',
+            'limitDate': _iso(account.limit_date) if account.limit_date else None,
+            'quests': [{'name': name, 'status': 'completed'} for name in sorted(account.completed_quests)],
+        })
+
+    async def visit(self, request: web.Request) -> web.Response:
+        self._account(request)
+        return web.json_response({'message': 'Visit registered'})
+
+    async def daily_rewards(self, request: web.Request) -> web.Response:
+        account = self._account(request)
+        return web.json_response({'current': '0' if account.daily_claimed else '1'})
+
+    async def daily_claim(self, request: web.Request) -> web.Response:
+        account = self._account(request)
+        if account.daily_claimed:
+            return web.json_response({'message': 'Already claimed'}, status=400)
+        account.daily_claimed = True
+        account.balance += 500
+        return web.json_response({'message': 'Daily reward claimed'})
+
+    async def quests(self, request: web.Request) -> web.Response:
+        return web.json_response([{'name': f'quest_{i}', 'checkType': 'timer'} for i in range(self.config.quests)])
+
+    async def finish_quest(self, request: web.Request) -> web.Response:
+        account = self._account(request)
+        account.completed_quests.add((await request.json())['questName'])
+        account.balance += 1000
+        return web.json_response({'message': 'Quest marked as finished'})
+
+    async def taps_claim(self, request: web.Request) -> web.Response:
+        account = self._account(request)
+        now = datetime.now(timezone.utc)
+        if account.limit_date and account.limit_date > now:
+            return web.json_response({'message': 'Game on cooldown'}, status=400)
+        account.balance += float((await request.json())['amount'])
+        account.limit_date = now + timedelta(seconds=self.config.cooldown)
+        return web.json_response({'message': 'Taps claimed'})
+
+    async def ads(self, request: web.Request) -> web.Response:
+        return web.json_response({'available': self._account(request).ads})
+
+    async def watch_ad(self, request: web.Request) -> web.Response:
+        account = self._account(request)
+        if account.ads <= 0:
+            return web.json_response({'message': 'No ads available'}, status=400)
+        account.ads -= 1
+        account.limit_date = None
+        return web.json_response({'message': 'Ad bonus applied!'})
+
+    async def upgrades(self, request: web.Request) -> web.Response:
+        account = self._account(request)
+        return web.json_response({
+            upgrade_type: [{'level': level, 'price': str(_price(level))},
+                           {'level': level + 1, 'price': str(_price(level + 1))}]
+            for upgrade_type, level in account.levels.items()
+        })
+
+    async def buy_upgrade(self, request: web.Request) -> web.Response:
+        account = self._account(request)
+        upgrade_type = (await request.json())['type']
+        price = _price(account.levels[upgrade_type])
+        if account.balance < price:
+            return web.json_response({'message': 'Not enough balance'}, status=400)
+        account.balance -= price
+        account.levels[upgrade_type] += 1
+        return web.json_response({'message': 'Your level has been raised!'})
+
+
+def serve(config: MockConfig, conn) -> None:
+    async def main() -> None:
+        mock = MockDiamoreApi(config)
+        conn.send(await mock.start())
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
@@ -0,0 +1,309 @@
+import os
+import json
+import time
+import heapq
+import asyncio
+import argparse
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from itertools import count
+from statistics import quantiles
+
+os.environ.setdefault('API_ID', '1')
+os.environ.setdefault('API_HASH', 'simulation')
+
+from bot.utils import logger
+from bot.utils.clock import Clock
+from bot.core.models import DailyRewards, Quest, UpgradeLevel, Upgrades, User, UserQuest
+from bot.core.quests import quest_catalog
+from bot.core.state import state_store
+from bot.core.tapper import Tapper
+
+
+DAY = 86400
+START = datetime(2024, 6, 3, 9, 30, tzinfo=timezone.utc).timestamp()
+
+
+class FakeClock(Clock):
+    """Virtual time: advances to the next timer as soon as every simulated account is waiting on one."""
+
+    def __init__(self, start: float, until: float):
+        self.current = start
+        self.until = until
+        self.active = 0
+        self.finished = asyncio.Event()
+        self._timers: list[tuple[float, int, asyncio.Future]] = []
+        self._counter = count()
+
+    def time(self) -> float:
+        return self.current
+
+    async def sleep(self, seconds: float) -> None:
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._timers, (self.current + max(0.0, seconds), next(self._counter), future))
+        self._advance()
+        await future
+
+    def _advance(self) -> None:
+        if not self._timers or len(self._timers) < self.active:
+            return
+
+        wake_at, _, future = heapq.heappop(self._timers)
+        if wake_at >= self.until:
+            self.finished.set()
+            return
+        self.current = max(self.current, wake_at)
+        future.set_result(None)
+
+    async def run(self, coro) -> None:
+        self.active += 1
+        try:
+            await coro
+        finally:
+            self.active -= 1
+            self._advance()
+
+
+@dataclass
+class ModelConfig:
+    cooldown: float = 3600
+    cooldown_step: float = 0.05
+    ads_per_day: int = 3
+    quests: int = 10
+    quest_reward: int = 1000
+    daily_reward: int = 500
+    balance: float = 0
+
+
+@dataclass
+class ModelAccount:
+    balance: float
+    limit_date: float = 0
+    ads: int = 0
+    ads_day: int = -1
+    daily_day: int = -1
+    completed_quests: set[str] = field(default_factory=set)
+    levels: dict[str, int] = field(default_factory=lambda: {'tapPower': 1, 'tapDuration': 1, 'tapCoolDown': 1})
+
+
+def _iso(timestamp: float) -> str:
+    moment = datetime.fromtimestamp(timestamp, timezone.utc)
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.') + f'{moment.microsecond // 1000:03d}Z'
+
+
+def _price(level: int) -> int:
+    return 1000 * 2 ** (level - 1)
+
+
+class ScriptedApi:
+    """In-process stand-in for DiamoreApi that answers instantly from a per-account model."""
+
+    def __init__(self, model: 'GameModel', account: ModelAccount):
+        self.model = model
+        self.account = account
+
+    def _hit(self, endpoint: str) -> None:
+        self.model.requests[endpoint] += 1
+
+    def _day(self) -> int:
+        return int(self.model.clock.time() // DAY)
+
+    def _refresh_ads(self) -> None:
+        if self.account.ads_day != self._day():
+            self.account.ads_day = self._day()
+            self.account.ads = self.model.config.ads_per_day
+
+    async def user(self) -> User:
+        self._hit('/user/visit')
+        self._hit('/user')
+        account = self.account
+        return User(balance=f'{account.balance:.3f}',
+                    limitDate=_iso(account.limit_date) if account.limit_date else None,
+                    quests=[UserQuest(name=name, status='completed') for name in sorted(account.completed_quests)])
+
+    async def get_rewards(self) -> DailyRewards:
+        self._hit('/daily/rewards')
+        return DailyRewards(current='0' if self.account.daily_day == self._day() else '1')
+
+    async def claim_daily(self) -> bool:
+        self._hit('/daily/claim')
+        if self.account.daily_day == self._day():
+            return False
+        self.account.daily_day = self._day()
+        self.account.balance += self.model.config.daily_reward
+        self.model.earned['daily'] += self.model.config.daily_reward
+        return True
+
+    async def get_quests(self) -> list[Quest]:
+        self._hit('/quests')
+        return [Quest(name=f'quest_{i}', checkType='timer') for i in range(self.model.config.quests)]
+
+    async def finish_quest(self, quest_name: str) -> bool:
+        self._hit('/quests/finish')
+        if quest_name in self.account.completed_quests:
+            return False
+        self.account.completed_quests.add(quest_name)
+        self.account.balance += self.model.config.quest_reward
+        self.model.earned['quests'] += self.model.config.quest_reward
+        return True
+
+    async def claim_taps(self, amount: int) -> bool:
+        self._hit('/taps/claim')
+        now = self.model.clock.time()
+        account = self.account
+        if account.limit_date and account.limit_date > now:
+            self.model.rejected_taps += 1
+            return False
+
+        if account.limit_date:
+            self.model.lateness.append(now - account.limit_date)
+        reward = amount * account.levels['tapPower']
+        account.balance += reward
+        account.limit_date = now + self.model.cooldown(account)
+        self.model.earned['taps'] += reward
+        self.model.taps += 1
+        return True
+
+    async def get_ads_limit(self) -> int:
+        self._hit('/ads')
+        self._refresh_ads()
+        return self.account.ads
+
+    async def watch_ad(self) -> bool:
+        self._hit('/ads/watch')
+        self._refresh_ads()
+        if self.account.ads <= 0:
+            return False
+        self.account.ads -= 1
+        self.account.limit_date = 0
+        return True
+
+    async def get_upgrades(self) -> Upgrades:
+        self._hit('/upgrades')
+        return Upgrades(**{
+            upgrade_type: [UpgradeLevel(level=level, price=str(_price(level))),
+                           UpgradeLevel(level=level + 1, price=str(_price(level + 1)))]
+            for upgrade_type, level in self.account.levels.items()
+        })
+
+    async def buy_upgrade(self, type: str) -> bool:
+        self._hit('/upgrades/buy')
+        price = _price(self.account.levels[type])
+        if self.account.balance < price:
+            return False
+        self.account.balance -= price
+        self.account.levels[type] += 1
+        self.model.spent += price
+        return True
+
+    async def close(self) -> None:
+        pass
+
+
+class GameModel:
+    def __init__(self, clock: FakeClock, config: ModelConfig):
+        self.clock = clock
+        self.config = config
+        self.accounts: dict[str, ModelAccount] = {}
+        self.requests: Counter[str] = Counter()
+        self.earned: Counter[str] = Counter()
+        self.spent = 0
+        self.taps = 0
+        self.rejected_taps = 0
+        self.lateness: list[float] = []
+
+    def cooldown(self, account: ModelAccount) -> float:
+        factor = max(0.1, 1 - self.config.cooldown_step * (account.levels['tapCoolDown'] - 1))
+        return self.config.cooldown * factor
+
+    def api(self, session_name: str) -> ScriptedApi:
+        account = self.accounts.get(session_name)
+        if account is None:
+            account = self.accounts[session_name] = ModelAccount(balance=self.config.balance)
+        return ScriptedApi(self, account)
+
+
+class SimulatedTapper(Tapper):
+    __slots__ = ()
+    model: GameModel
+
+    async def get_tg_web_data(self, proxy: str | None) -> str:
+        return f'query_id={self.session_name}&hash=simulation'
+
+    async def open_api(self) -> ScriptedApi:
+        return self.model.api(self.session_name)
+
+
+def percentile(values: list[float], pct: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return quantiles(values, n=100, method='inclusive')[pct - 1]
+
+
+async def simulate(args: argparse.Namespace) -> dict:
+    clock = FakeClock(start=START, until=START + args.days * DAY)
+    model = GameModel(clock, ModelConfig(cooldown=args.cooldown, ads_per_day=args.ads, quests=args.quests))
+    SimulatedTapper.model = model
+    quest_catalog.clock = clock
+
+    tappers = [SimulatedTapper(session_name=f'sim_{i}', clock=clock) for i in range(args.accounts)]
+    tasks = [asyncio.create_task(clock.run(tapper.run())) for tapper in tappers]
+
+    await clock.finished.wait()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    days = args.days
+    accounts = args.accounts
+    requests = sum(model.requests.values())
+    earned = sum(model.earned.values())
+    return {
+        'accounts': accounts,
+        'days': days,
+        'requests': requests,
+        'requests_per_account_day': round(requests / accounts / days, 1),
+        'diamonds_earned': round(earned),
+        'diamonds_per_account_day': round(earned / accounts / days),
+        'diamonds_spent_on_upgrades': model.spent,
+        'earned_by_source': dict(model.earned),
+        'games_per_account_day': round(model.taps / accounts / days, 2),
+        'rejected_taps': model.rejected_taps,
+        'tap_delay_p50': round(percentile(model.lateness, 50), 1),
+        'tap_delay_p95': round(percentile(model.lateness, 95), 1),
+        'tap_delay_max': round(max(model.lateness, default=0), 1),
+        'requests_by_endpoint': dict(model.requests.most_common()),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run Tapper cycles for simulated accounts on a virtual clock")
+    parser.add_argument("--accounts", type=int, default=200)
+    parser.add_argument("--days", type=float, default=7)
+    parser.add_argument("--cooldown", type=float, default=3600, help="Game cooldown at upgrade level 1, sec")
+    parser.add_argument("--ads", type=int, default=3, help="Ads available per account per day")
+    parser.add_argument("--quests", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--verbose", action="store_true", help="Keep the bot's own log output")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logger.remove()
+    state_store.path = ':memory:'
+
+    started = time.perf_counter()
+    report = asyncio.run(simulate(args))
+    report['wall_secs'] = round(time.perf_counter() - started, 2)
+
+    if args.json:
+        print(json.dumps(report))
+    else:
+        for key, value in report.items():
+            print(f"{key:<28} {value}")
+
+    state_store.close()
+
+
+if __name__ == '__main__':
+    main()
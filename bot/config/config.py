@@ -22,6 +22,42 @@ class Settings(BaseSettings):
 
     USE_PROXY_FROM_FILE: bool = False
 
+    MAX_CONCURRENT_CYCLES: int = 10
+
+    TG_WEB_DATA_TTL: int = 86400
+    TG_WEB_DATA_REFRESH_MARGIN: int = 600
+    TG_AUTH_CONCURRENCY: int = 5
+    TG_AUTH_STAGGER: float = 1.0
+
+    REQUEST_RETRIES: int = 3
+    REQUEST_BACKOFF_BASE: float = 1.0
+    REQUEST_BACKOFF_MAX: float = 30.0
+    CIRCUIT_BREAKER_THRESHOLD: int = 20
+    CIRCUIT_BREAKER_RESET: int = 60
+
+    API_URL: str = 'https://api.diamore.co'
+    HTTP_POOL_SIZE: int = 100
+
+    PROXY_CHECK_CONCURRENCY: int = 20
+    PROXY_CHECK_TTL: int = 600
+
+    METRICS_HOST: str = '127.0.0.1'
+    METRICS_PORT: int = 0
+
+    RATE_LIMIT_HOST: float = 20
+    RATE_LIMIT_HOST_BURST: int = 40
+    RATE_LIMIT_PROXY: float = 5
+    RATE_LIMIT_PROXY_BURST: int = 10
+
+    QUEST_CATALOG_TTL: int = 3600
+
+    LOG_LEVEL: str = 'INFO'
+    LOG_FORMAT: str = 'text'
+    LOG_ENQUEUE: bool = False
+    LOG_SUMMARY_INTERVAL: int = 0
+
+    LOOP_LAG_WARNING: float = 0.5
+
 
 settings = Settings()
 
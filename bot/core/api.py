@@ -0,0 +1,205 @@
+import time
+import asyncio
+import functools
+from typing import Awaitable, Callable
+
+import aiohttp
+from aiocfscrape import CloudflareScraper
+from aiohttp_proxy import ProxyConnector
+from yarl import URL
+
+from bot.config import settings
+from bot.utils import logger
+from bot.utils.metrics import metrics
+from .headers import headers
+from .models import Ads, DailyRewards, Quest, Upgrades, User, decode
+from .policy import request_policy
+from .rate_limit import rate_limiter
+
+
+class ConnectorPool:
+    def __init__(self):
+        self._connectors: dict[str | None, aiohttp.TCPConnector] = {}
+
+    def get(self, proxy: str | None) -> aiohttp.TCPConnector:
+        connector = self._connectors.get(proxy)
+        if connector is None or connector.closed:
+            options = dict(limit=settings.HTTP_POOL_SIZE, ttl_dns_cache=300, keepalive_timeout=30)
+            if proxy:
+                connector = ProxyConnector.from_url(proxy, **options)
+            else:
+                connector = aiohttp.TCPConnector(**options)
+            self._connectors[proxy] = connector
+        return connector
+
+    async def close(self) -> None:
+        for connector in self._connectors.values():
+            await connector.close()
+        self._connectors.clear()
+
+
+connector_pool = ConnectorPool()
+
+
+def memoized(key: str):
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(api: 'DiamoreApi'):
+            if key in api.memo:
+                return api.memo[key]
+            result = await func(api)
+            if result is not None:
+                api.memo[key] = result
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def invalidates(*keys: str):
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(api: 'DiamoreApi', *args, **kwargs):
+            try:
+                return await func(api, *args, **kwargs)
+            finally:
+                for key in keys:
+                    api.memo.pop(key, None)
+
+        return wrapper
+
+    return decorator
+
+
+class DiamoreApi:
+    def __init__(self, proxy: str | None = None, session_name: str | None = None):
+        self.proxy = proxy
+        self.log = logger.bind(account=session_name) if session_name else logger
+        self.host = URL(settings.API_URL).host
+        self.http_client = CloudflareScraper(headers=headers, connector=connector_pool.get(proxy),
+                                             connector_owner=False)
+        self.reauthorize: Callable[[], Awaitable[str | None]] | None = None
+        self._auth_lock = asyncio.Lock()
+        self.memo: dict[str, object] = {}
+
+    def authorize(self, tg_web_data: str, user_agent: str) -> None:
+        self.http_client.headers["User-Agent"] = user_agent
+        self.http_client.headers['Authorization'] = f'Token {tg_web_data}'
+
+    async def close(self) -> None:
+        await self.http_client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    def _url(self, path: str) -> str:
+        return f'{settings.API_URL}{path}'
+
+    async def refresh_auth(self, authorization: str | None) -> bool:
+        if self.reauthorize is None:
+            return False
+
+        async with self._auth_lock:
+            if self.http_client.headers.get('Authorization') != authorization:
+                return True
+
+            tg_web_data = await self.reauthorize()
+            if not tg_web_data:
+                return False
+            self.http_client.headers['Authorization'] = f'Token {tg_web_data}'
+            return True
+
+    async def _request(self, method: str, path: str, payload: dict | None = None,
+                       strict: bool = False) -> tuple[int, bytes]:
+        authorization = self.http_client.headers.get('Authorization')
+        try:
+            return await self._send(method, path, payload, strict)
+        except aiohttp.ClientResponseError as error:
+            if error.status != 401 or not await self.refresh_auth(authorization):
+                raise
+        return await self._send(method, path, payload, strict)
+
+    async def _send(self, method: str, path: str, payload: dict | None, strict: bool) -> tuple[int, bytes]:
+        await rate_limiter.acquire(host=self.host, proxy=self.proxy)
+
+        started = time.perf_counter()
+        status = 'error'
+        try:
+            async with self.http_client.request(method, self._url(path), json=payload) as response:
+                status = response.status
+                if strict or response.status >= 500 or response.status == 401:
+                    response.raise_for_status()
+                return response.status, await response.read()
+        finally:
+            latency = time.perf_counter() - started
+            metrics.observe_request(path, status, latency, proxy=self.proxy)
+            self.log.bind(endpoint=path, status=status, latency=round(latency, 3)).debug("{} {} {} in {:.3f}s",
+                                                                                        method, path, status, latency)
+
+    async def _get(self, path: str, tp):
+        _, body = await self._request('GET', path, strict=True)
+        return decode(body, tp)
+
+    async def _post(self, path: str, payload: dict | None = None) -> dict:
+        _, body = await self._request('POST', path, payload)
+        return decode(body, dict) if body else {}
+
+    @memoized('user')
+    @request_policy(endpoint='user', error_message="Auth request error happened")
+    async def user(self) -> User:
+        await self._request('POST', '/user/visit')
+        return await self._get('/user', User)
+
+    @memoized('daily/rewards')
+    @request_policy(endpoint='daily/rewards', error_message="Get rewards error happened")
+    async def get_rewards(self) -> DailyRewards:
+        return await self._get('/daily/rewards', DailyRewards)
+
+    @invalidates('user', 'daily/rewards')
+    @request_policy(endpoint='daily/claim', error_message="Daily claim error happened", retry=False)
+    async def claim_daily(self) -> bool:
+        status, _ = await self._request('POST', '/daily/claim')
+        return status in [200, 201]
+
+    @request_policy(endpoint='quests', error_message="Get quests error happened")
+    async def get_quests(self) -> list[Quest]:
+        return await self._get('/quests', list[Quest])
+
+    @invalidates('user')
+    @request_policy(endpoint='quests/finish', error_message="Finish quests error happened", retry=False)
+    async def finish_quest(self, quest_name: str) -> bool:
+        data = await self._post('/quests/finish', {"questName": f'{quest_name}'})
+        return data.get('message') == 'Quest marked as finished'
+
+    @invalidates('user')
+    @request_policy(endpoint='taps/claim', error_message="Sync clicks error happened", retry=False)
+    async def claim_taps(self, amount: int) -> bool:
+        data = await self._post('/taps/claim', {"amount": str(amount)})
+        return data.get('message') == 'Taps claimed'
+
+    @memoized('ads')
+    @request_policy(endpoint='ads', error_message="Get ads limit error happened", default=0)
+    async def get_ads_limit(self) -> int:
+        ads = await self._get('/ads', Ads)
+        return ads.available or 0
+
+    @invalidates('user', 'ads')
+    @request_policy(endpoint='ads/watch', error_message="Watch ads error happened", default=False, retry=False)
+    async def watch_ad(self) -> bool:
+        data = await self._post('/ads/watch', {"type": "adsgram"})
+        return data.get('message') == 'Ad bonus applied!'
+
+    @memoized('upgrades')
+    @request_policy(endpoint='upgrades', error_message="Get upgrades error happened")
+    async def get_upgrades(self) -> Upgrades:
+        return await self._get('/upgrades', Upgrades)
+
+    @invalidates('user', 'upgrades')
+    @request_policy(endpoint='upgrades/buy', error_message="Do upgrade error happened", default=False, retry=False)
+    async def buy_upgrade(self, type: str) -> bool:
+        data = await self._post('/upgrades/buy', {"type": type})
+        return data.get('message') == 'Your level has been raised!'
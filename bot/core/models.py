@@ -0,0 +1,107 @@
+import json
+from functools import lru_cache
+from dataclasses import dataclass, field, fields, is_dataclass
+from typing import get_args, get_type_hints
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Field names follow the API payload so msgspec can decode straight into these classes.
+
+@dataclass(slots=True)
+class UserQuest:
+    name: str = ''
+    status: str | None = None
+
+
+@dataclass(slots=True)
+class User:
+    balance: str | float = 0
+    limitDate: str | None = None
+    quests: list[UserQuest] = field(default_factory=list)
+
+    @property
+    def balance_int(self) -> int:
+        return int(float(self.balance))
+
+
+@dataclass(slots=True)
+class Quest:
+    name: str = ''
+    checkType: str | None = None
+
+
+@dataclass(slots=True)
+class UpgradeLevel:
+    level: int = 0
+    price: str | float = 0
+
+
+@dataclass(slots=True)
+class Upgrades:
+    tapPower: list[UpgradeLevel] = field(default_factory=list)
+    tapDuration: list[UpgradeLevel] = field(default_factory=list)
+    tapCoolDown: list[UpgradeLevel] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Ads:
+    available: int | None = 0
+
+
+@dataclass(slots=True)
+class DailyRewards:
+    current: str | int | None = None
+
+
+@lru_cache(maxsize=None)
+def _builder(tp):
+    args = get_args(tp)
+    if args and is_dataclass(args[0]):
+        item_builder = _builder(args[0])
+        return lambda data: [item_builder(item) for item in data] if isinstance(data, list) else data
+
+    if not is_dataclass(tp):
+        return None
+
+    hints = get_type_hints(tp)
+    nested = {f.name: _builder(hints[f.name]) for f in fields(tp)}
+    plain = tuple(name for name, builder in nested.items() if builder is None)
+    nested = tuple((name, builder) for name, builder in nested.items() if builder is not None)
+
+    def build(data):
+        if not isinstance(data, dict):
+            raise ValueError(f"Expected object for {tp.__name__}, got {type(data).__name__}")
+        kwargs = {name: data[name] for name in plain if name in data}
+        for name, builder in nested:
+            if name in data:
+                kwargs[name] = builder(data[name])
+        return tp(**kwargs)
+
+    return build
+
+
+if msgspec is not None:
+    _decoders: dict = {}
+
+    def decode(body: bytes, tp):
+        decoder = _decoders.get(tp)
+        if decoder is None:
+            decoder = _decoders[tp] = msgspec.json.Decoder(tp)
+        return decoder.decode(body)
+
+else:
+    _loads = orjson.loads if orjson is not None else json.loads
+
+    def decode(body: bytes, tp):
+        builder = _builder(tp)
+        data = _loads(body)
+        return builder(data) if builder is not None else data
@@ -0,0 +1,137 @@
+import asyncio
+import functools
+import time
+from random import uniform
+
+import aiohttp
+
+from bot.config import settings
+from bot.utils import logger
+from bot.utils.metrics import metrics
+
+
+class CircuitBreaker:
+    def __init__(self, endpoint: str, threshold: int, reset_timeout: float):
+        self.endpoint = endpoint
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def retry_after(self) -> float:
+        if self.opened_at is None:
+            return 0
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if self._probing or self.retry_after() > 0:
+            return False
+        self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        if self.opened_at is not None:
+            logger.info(f"<light-yellow>{self.endpoint}</light-yellow> | API recovered, circuit closed")
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_skipped(self) -> None:
+        # The request never reached the API, let the next one probe instead
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probing or (self.opened_at is None and self.failures >= self.threshold):
+            if self.opened_at is None:
+                logger.warning(f"<light-yellow>{self.endpoint}</light-yellow> | API degraded after {self.failures} "
+                               f"failures, pausing requests for {self.reset_timeout}s")
+            self.opened_at = time.monotonic()
+            self._probing = False
+
+
+breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(endpoint: str) -> CircuitBreaker:
+    breaker = breakers.get(endpoint)
+    if breaker is None:
+        breaker = breakers[endpoint] = CircuitBreaker(endpoint=endpoint,
+                                                      threshold=settings.CIRCUIT_BREAKER_THRESHOLD,
+                                                      reset_timeout=settings.CIRCUIT_BREAKER_RESET)
+    return breaker
+
+
+def is_degraded() -> bool:
+    return any(breaker.is_open for breaker in breakers.values())
+
+
+def retry_after(endpoint: str) -> float:
+    return max(get_breaker(endpoint).retry_after(), settings.REQUEST_BACKOFF_MAX)
+
+
+def backoff(attempt: int) -> float:
+    return uniform(0, min(settings.REQUEST_BACKOFF_MAX, settings.REQUEST_BACKOFF_BASE * 2 ** attempt))
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status >= 500 or error.status == 429
+    return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError))
+
+
+def is_connect_error(error: Exception) -> bool:
+    # Raised before the request is sent: the connection to the API or to the proxy was never established
+    return isinstance(error, (aiohttp.ClientConnectorError, aiohttp.ClientHttpProxyError))
+
+
+def request_policy(endpoint: str, error_message: str, default=None, retry: bool = True):
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(api, *args, **kwargs):
+            breaker = get_breaker(endpoint)
+
+            for attempt in range(settings.REQUEST_RETRIES + 1):
+                if not breaker.allow():
+                    return default
+
+                try:
+                    result = await func(api, *args, **kwargs)
+                except Exception as error:
+                    connect_error = is_connect_error(error)
+                    if api.proxy and connect_error:
+                        # A dead proxy says nothing about the API, keep it out of the breaker every account shares
+                        breaker.record_skipped()
+                    elif is_retryable(error):
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+
+                    if not is_retryable(error):
+                        api.log.bind(endpoint=f'/{endpoint}').error(f"{error_message}: {error}")
+                        return default
+
+                    # Writes are only replayed when they provably never reached the server
+                    if (attempt == settings.REQUEST_RETRIES or breaker.is_open
+                            or not (retry or connect_error)):
+                        api.log.bind(endpoint=f'/{endpoint}').error(f"{error_message}: {error}")
+                        return default
+
+                    metrics.observe_retry(f'/{endpoint}')
+                    await asyncio.sleep(backoff(attempt))
+                else:
+                    breaker.record_success()
+                    return result
+
+            return default
+
+        return wrapper
+
+    return decorator
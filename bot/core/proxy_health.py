@@ -0,0 +1,77 @@
+import time
+import asyncio
+from dataclasses import dataclass
+
+import aiohttp
+
+from bot.config import settings
+from bot.utils import logger
+from bot.utils.metrics import metrics, proxy_label
+from .api import connector_pool
+
+
+CHECK_URL = 'https://httpbin.org/ip'
+CHECK_TIMEOUT = 5
+
+
+@dataclass(slots=True)
+class ProxyStatus:
+    alive: bool
+    checked_at: float
+    ip: str | None = None
+    error: str | None = None
+
+
+class ProxyHealth:
+    def __init__(self):
+        self.statuses: dict[str, ProxyStatus] = {}
+
+    def is_alive(self, proxy: str | None) -> bool:
+        if not proxy:
+            return True
+        status = self.statuses.get(proxy)
+        return status is None or status.alive
+
+    def is_fresh(self, proxy: str) -> bool:
+        status = self.statuses.get(proxy)
+        return status is not None and time.monotonic() - status.checked_at < settings.PROXY_CHECK_TTL
+
+    async def probe(self, proxy: str) -> ProxyStatus:
+        try:
+            async with aiohttp.ClientSession(connector=connector_pool.get(proxy), connector_owner=False) as session:
+                async with session.get(CHECK_URL, timeout=aiohttp.ClientTimeout(CHECK_TIMEOUT)) as response:
+                    response.raise_for_status()
+                    ip = (await response.json(content_type=None)).get('origin')
+            status = ProxyStatus(alive=True, checked_at=time.monotonic(), ip=ip)
+        except Exception as error:
+            status = ProxyStatus(alive=False, checked_at=time.monotonic(), error=str(error) or type(error).__name__)
+
+        previous = self.statuses.get(proxy)
+        if previous is not None and previous.alive != status.alive:
+            state = 'back online' if status.alive else f'down: {status.error}'
+            logger.warning(f"<light-yellow>{proxy_label(proxy)}</light-yellow> | Proxy {state}")
+
+        self.statuses[proxy] = status
+        metrics.proxy_alive[proxy_label(proxy)] = int(status.alive)
+        return status
+
+    async def check(self, proxies: list[str | None], force: bool = False) -> dict[str, ProxyStatus]:
+        distinct = [proxy for proxy in dict.fromkeys(proxies) if proxy and (force or not self.is_fresh(proxy))]
+        if distinct:
+            semaphore = asyncio.Semaphore(max(1, settings.PROXY_CHECK_CONCURRENCY))
+
+            async def bounded(proxy: str) -> ProxyStatus:
+                async with semaphore:
+                    return await self.probe(proxy)
+
+            await asyncio.gather(*map(bounded, distinct))
+
+        return {proxy: self.statuses[proxy] for proxy in dict.fromkeys(proxies) if proxy in self.statuses}
+
+    async def run(self, proxies: list[str | None]) -> None:
+        while True:
+            await asyncio.sleep(settings.PROXY_CHECK_TTL)
+            await self.check(proxies, force=True)
+
+
+proxy_health = ProxyHealth()
@@ -0,0 +1,43 @@
+import asyncio
+
+from bot.config import settings
+from bot.utils import logger
+from bot.utils.clock import Clock, system_clock
+from .api import DiamoreApi
+
+
+class QuestCatalog:
+    def __init__(self, clock: Clock = system_clock):
+        self.clock = clock
+        self.names: frozenset[str] = frozenset()
+        self.version = 0
+        self.fetched_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def is_fresh(self) -> bool:
+        return self.version > 0 and self.clock.time() - self.fetched_at < settings.QUEST_CATALOG_TTL
+
+    async def get(self, api: DiamoreApi) -> frozenset[str] | None:
+        if self.is_fresh():
+            return self.names
+
+        async with self._lock:
+            if self.is_fresh():
+                return self.names
+
+            quests = await api.get_quests()
+            if quests is None:
+                return self.names if self.version else None
+
+            names = frozenset(quest.name for quest in quests if quest.checkType == 'timer')
+            if names != self.names or not self.version:
+                added = len(names - self.names)
+                self.names = names
+                self.version += 1
+                logger.info(f"Quest catalog updated | {len(names)} quests, {added} new")
+            self.fetched_at = self.clock.time()
+
+            return self.names
+
+
+quest_catalog = QuestCatalog()
@@ -0,0 +1,61 @@
+import time
+import asyncio
+
+from bot.config import settings
+from bot.utils.metrics import metrics, proxy_label
+
+
+class TokenBucket:
+    def __init__(self, name: str, rate: float, burst: int):
+        self.name = name
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated_at = time.monotonic()
+        self.waiting = 0
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self) -> None:
+        self.waiting += 1
+        metrics.rate_limit_waiting[self.name] = self.waiting
+        try:
+            async with self._lock:
+                self._refill()
+                if self.tokens < 1:
+                    await asyncio.sleep((1 - self.tokens) / self.rate)
+                    self._refill()
+                self.tokens -= 1
+        finally:
+            self.waiting -= 1
+            metrics.rate_limit_waiting[self.name] = self.waiting
+
+
+class RateLimiter:
+    def __init__(self):
+        self.buckets: dict[str, TokenBucket] = {}
+
+    def _bucket(self, name: str, rate: float, burst: int) -> TokenBucket | None:
+        if rate <= 0:
+            return None
+        bucket = self.buckets.get(name)
+        if bucket is None:
+            bucket = self.buckets[name] = TokenBucket(name=name, rate=rate, burst=burst)
+        return bucket
+
+    async def acquire(self, host: str, proxy: str | None) -> None:
+        buckets = [self._bucket(f'host:{host}', settings.RATE_LIMIT_HOST, settings.RATE_LIMIT_HOST_BURST)]
+        if proxy:
+            buckets.append(self._bucket(f'proxy:{proxy_label(proxy)}', settings.RATE_LIMIT_PROXY,
+                                        settings.RATE_LIMIT_PROXY_BURST))
+
+        for bucket in buckets:
+            if bucket is not None:
+                await bucket.acquire()
+
+
+rate_limiter = RateLimiter()
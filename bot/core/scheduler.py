@@ -0,0 +1,145 @@
+import time
+import asyncio
+import heapq
+from itertools import count
+from contextlib import suppress
+
+from bot.config import settings
+from bot.utils import logger
+from bot.utils.metrics import metrics
+from bot.utils.log_summary import log_summary
+from bot.exceptions import InvalidSession, TelegramFloodWait
+from .tapper import Tapper
+
+
+SETUP_RETRY_DELAY = 30
+ERROR_RETRY_MAX = 3600
+
+
+class Scheduler:
+    def __init__(self, workers: int = settings.MAX_CONCURRENT_CYCLES):
+        self.workers = max(1, workers)
+        self._deadlines: list[tuple[float, int, Tapper]] = []
+        self._counter = count()
+        self._changed = asyncio.Event()
+        self._ready: asyncio.Queue[Tapper] = asyncio.Queue()
+        self._prepared: set[str] = set()
+        self._failures: dict[str, int] = {}
+        self._total = 0
+        self._started_at = 0.0
+
+    def schedule(self, tapper: Tapper, delay: float = 0) -> None:
+        loop = asyncio.get_running_loop()
+        heapq.heappush(self._deadlines, (loop.time() + delay, next(self._counter), tapper))
+        self._changed.set()
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            self._changed.clear()
+
+            if not self._deadlines:
+                await self._changed.wait()
+                continue
+
+            deadline = self._deadlines[0][0]
+            delay = deadline - loop.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, tapper = heapq.heappop(self._deadlines)
+            await self._ready.put(tapper)
+
+    async def _work(self) -> None:
+        while True:
+            tapper = await self._ready.get()
+            started = time.perf_counter()
+            try:
+                sleep_time = await self._run_once(tapper)
+            except InvalidSession:
+                tapper.log.error(f"{tapper.session_name} | Invalid Session")
+                await tapper.close()
+            except Exception as error:
+                delay = self._error_delay(tapper)
+                # The error text is passed as an argument so that "<...>" in it is not parsed as color markup
+                tapper.log.error("{} | Cycle failed: {!r}, retry in {}s", tapper.session_name, error, delay)
+                self.schedule(tapper, delay=delay)
+                with suppress(Exception):
+                    await tapper.close()
+            else:
+                metrics.observe_cycle(tapper.session_name, time.perf_counter() - started, sleep_time)
+                self.schedule(tapper, delay=sleep_time)
+            finally:
+                self._ready.task_done()
+
+    def _error_delay(self, tapper: Tapper) -> int:
+        failures = self._failures.get(tapper.session_name, 0)
+        self._failures[tapper.session_name] = failures + 1
+        return min(SETUP_RETRY_DELAY * 2 ** failures, ERROR_RETRY_MAX)
+
+    async def _run_once(self, tapper: Tapper) -> int:
+        if tapper.session_name not in self._prepared:
+            try:
+                await tapper.setup()
+            except InvalidSession:
+                raise
+            except TelegramFloodWait as error:
+                tapper.log.info("<light-yellow>{}</light-yellow> | Sleep {}s", tapper.session_name,
+                                round(error.seconds))
+                return error.seconds
+            except Exception as error:
+                delay = self._error_delay(tapper)
+                tapper.log.error("{} | Unknown error during setup: {}, retry in {}s", tapper.session_name, error, delay)
+                return delay
+            self._prepared.add(tapper.session_name)
+            self._report_progress()
+
+        sleep_time = await tapper.run_cycle()
+        self._failures.pop(tapper.session_name, None)
+        return sleep_time
+
+    def _report_progress(self) -> None:
+        authenticated = len(self._prepared)
+        step = max(1, self._total // 10)
+        if authenticated == self._total:
+            logger.success(f"All {self._total} accounts authenticated in "
+                           f"{time.perf_counter() - self._started_at:.1f}s")
+        elif authenticated % step == 0:
+            logger.info(f"Authenticated {authenticated}/{self._total} accounts")
+
+    async def run(self, tappers: list[Tapper]) -> None:
+        self._total = len(tappers)
+        self._started_at = time.perf_counter()
+
+        now = time.time()
+        resumed = 0
+        ramp = 0
+        for tapper in tappers:
+            delay = max(0.0, tapper.state.next_wake - now)
+            resumed += delay > 0
+            if tapper.needs_tg_auth():
+                delay = max(delay, ramp * settings.TG_AUTH_STAGGER)
+                ramp += 1
+            self.schedule(tapper, delay=delay)
+
+        if resumed:
+            logger.info(f"{resumed}/{len(tappers)} accounts resume on cooldown from saved state")
+        if ramp:
+            logger.info(f"{ramp}/{len(tappers)} accounts need Telegram auth | {settings.TG_AUTH_CONCURRENCY} at a time, "
+                        f"one every {settings.TG_AUTH_STAGGER}s")
+
+        tasks = [asyncio.create_task(self._dispatch()), asyncio.create_task(log_summary.run())]
+        tasks += [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            for tapper in tappers:
+                await tapper.close()
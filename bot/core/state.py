@@ -0,0 +1,82 @@
+import json
+import time
+import sqlite3
+from dataclasses import dataclass, field, fields, astuple
+
+
+STATE_PATH = "sessions/state.sqlite3"
+
+
+@dataclass(slots=True)
+class AccountState:
+    session_name: str
+    balance: float = 0
+    limit_date: float = 0
+    next_wake: float = 0
+    completed_quests: list[str] = field(default_factory=list)
+    upgrade_levels: dict[str, int] = field(default_factory=dict)
+    daily_claimed_at: float = 0
+    daily_next_claim: float = 0
+    updated_at: float = 0
+
+
+_JSON_FIELDS = {'completed_quests', 'upgrade_levels'}
+_COLUMNS = [f.name for f in fields(AccountState)]
+
+
+class StateStore:
+    def __init__(self, path: str = STATE_PATH):
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # Every cycle commits on the event loop; in WAL mode NORMAL only syncs at checkpoints, not per commit
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS accounts (session_name TEXT PRIMARY KEY)")
+
+            existing = {row[1] for row in self._conn.execute("PRAGMA table_info(accounts)")}
+            for column in _COLUMNS:
+                if column not in existing:
+                    self._conn.execute(f"ALTER TABLE accounts ADD COLUMN {column}")
+            self._conn.commit()
+        return self._conn
+
+    def load(self, session_name: str) -> AccountState:
+        row = self.conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM accounts WHERE session_name = ?",
+                                (session_name,)).fetchone()
+        if row is None:
+            return AccountState(session_name=session_name)
+        return self._from_row(row)
+
+    def load_all(self) -> dict[str, AccountState]:
+        rows = self.conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM accounts")
+        return {state.session_name: state for state in map(self._from_row, rows)}
+
+    def save(self, state: AccountState) -> None:
+        state.updated_at = time.time()
+        values = [json.dumps(value) if name in _JSON_FIELDS else value
+                  for name, value in zip(_COLUMNS, astuple(state))]
+        self.conn.execute(f"INSERT OR REPLACE INTO accounts ({', '.join(_COLUMNS)}) "
+                          f"VALUES ({', '.join('?' * len(_COLUMNS))})", values)
+        self.conn.commit()
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    @staticmethod
+    def _from_row(row: tuple) -> AccountState:
+        values = {}
+        for name, value in zip(_COLUMNS, row):
+            if value is None:
+                continue
+            values[name] = json.loads(value) if name in _JSON_FIELDS else value
+        return AccountState(**values)
+
+
+state_store = StateStore()
@@ -1,32 +1,74 @@
+import sys
 import asyncio
+import time
+from typing import TYPE_CHECKING
 from urllib.parse import unquote, quote
 
-import aiohttp
-import json
-from aiocfscrape import CloudflareScraper
-from aiohttp_proxy import ProxyConnector
 from better_proxy import Proxy
-from pyrogram import Client
-from pyrogram.errors import Unauthorized, UserDeactivated, AuthKeyUnregistered, FloodWait
-from pyrogram.raw.functions.messages import RequestAppWebView
-from pyrogram.raw.types import InputBotAppShortName
 from bot.core.agents import generate_random_user_agent
 from bot.config import settings
 
 from bot.utils import logger
-from bot.exceptions import InvalidSession
-from .headers import headers
+from bot.utils.metrics import metrics, proxy_label
+from bot.utils.log_summary import log_summary
+from bot.utils.clock import Clock, system_clock
+from bot.exceptions import InvalidSession, TelegramFloodWait
+from .api import DiamoreApi
+from .models import Upgrades, User
+from .proxy_health import proxy_health
+from .quests import quest_catalog
+from .state import AccountState, state_store
+from . import web_data_cache
+from .policy import is_degraded, retry_after
+from .upgrades import UPGRADE_NAMES, plan_upgrades, upgrade_targets
 from datetime import datetime, timezone
-import pytz
 from random import randint
 
+if TYPE_CHECKING:
+    from pyrogram import Client
+
+
+DAILY_INTERVAL = 86400
+DAILY_RECHECK_INTERVAL = 3600
+
+
+def next_daily_check(claimed_at: float, now: float) -> float:
+    # The reset time is not documented: 24h after the last claim covers both a rolling window and a calendar day,
+    # past that re-check hourly until the reward opens
+    return max(claimed_at + DAILY_INTERVAL, now + DAILY_RECHECK_INTERVAL)
+
+
+tg_auth_semaphore = asyncio.Semaphore(max(1, settings.TG_AUTH_CONCURRENCY))
+
+AUTH_REFRESH_INTERVAL = 60
+
 
 class Tapper:
-    def __init__(self, tg_client: Client):
-        self.session_name = tg_client.name
-        self.tg_client = tg_client
+    __slots__ = ('session_name', 'proxy', 'api', 'state', 'user_agent', 'clock', 'auth_refreshed_at',
+                 'flood_wait_until', 'bound_log')
+
+    def __init__(self, session_name: str, proxy: str | None = None, state: AccountState | None = None,
+                 clock: Clock = system_clock):
+        self.session_name = session_name
+        self.clock = clock
+        self.proxy = proxy
+        self.api: DiamoreApi | None = None
+        self.auth_refreshed_at = float('-inf')
+        self.flood_wait_until = 0.0
+        self.bound_log = None
+        self.state = state or AccountState(session_name=session_name)
+        self.user_agent = generate_random_user_agent(device_type='android', browser_type='chrome')
+
+    @property
+    def log(self):
+        # Bound once per cycle and dropped by close(), so sleeping accounts do not keep a logger each
+        if self.bound_log is None:
+            self.bound_log = logger.bind(account=self.session_name)
+        return self.bound_log
+
+    def create_tg_client(self, proxy: str | None) -> 'Client':
+        from pyrogram import Client
 
-    async def get_tg_web_data(self, proxy: str | None) -> str:
         if proxy:
             proxy = Proxy.from_str(proxy)
             proxy_dict = dict(
@@ -39,37 +81,61 @@ class Tapper:
         else:
             proxy_dict = None
 
-        self.tg_client.proxy = proxy_dict
+        return Client(
+            name=self.session_name,
+            api_id=settings.API_ID,
+            api_hash=settings.API_HASH,
+            workdir="sessions/",
+            proxy=proxy_dict,
+            no_updates=True,
+        )
+
+    def needs_tg_auth(self) -> bool:
+        return web_data_cache.load(self.session_name) is None
+
+    async def get_tg_web_data(self, proxy: str | None) -> str | None:
+        tg_web_data = web_data_cache.load(self.session_name)
+        if tg_web_data:
+            return tg_web_data
 
-        try:
-            with_tg = True
+        if self.clock.time() < self.flood_wait_until:
+            raise TelegramFloodWait(self.flood_wait_until - self.clock.time())
 
-            if not self.tg_client.is_connected:
-                with_tg = False
-                try:
-                    await self.tg_client.connect()
-                except (Unauthorized, UserDeactivated, AuthKeyUnregistered):
-                    raise InvalidSession(self.session_name)
+        async with tg_auth_semaphore:
+            started = time.perf_counter()
+            tg_web_data = await self.request_tg_web_data(proxy=proxy)
+            metrics.observe_request('tg_web_data', 'ok' if tg_web_data else 'error', time.perf_counter() - started,
+                                    proxy=proxy)
+            return tg_web_data
 
-            while True:
-                try:
-                    peer = await self.tg_client.resolve_peer('DiamoreCryptoBot')
-                    break
-                except FloodWait as fl:
-                    fls = fl.value
+    async def request_tg_web_data(self, proxy: str | None) -> str | None:
+        # Pyrogram is only needed when the cached web data is missing or rejected, import it here
+        from pyrogram.errors import Unauthorized, UserDeactivated, AuthKeyUnregistered, FloodWait
+        from pyrogram.raw.functions.messages import RequestAppWebView
+        from pyrogram.raw.types import InputBotAppShortName
 
-                    logger.warning(f"<light-yellow>{self.session_name}</light-yellow> | FloodWait {fl}")
-                    logger.info(f"<light-yellow>{self.session_name}</light-yellow> | Sleep {fls}s")
+        tg_client = self.create_tg_client(proxy=proxy)
 
-                    await asyncio.sleep(fls + 3)
+        try:
+            try:
+                await tg_client.connect()
+            except (Unauthorized, UserDeactivated, AuthKeyUnregistered):
+                raise InvalidSession(self.session_name)
 
-            bot = await self.tg_client.resolve_peer('DiamoreCryptoBot')
-            app = InputBotAppShortName(bot_id=bot, short_name="app")
+            try:
+                peer = await tg_client.resolve_peer('DiamoreCryptoBot')
+            except FloodWait as fl:
+                # Hand the auth slot and the scheduler worker back instead of sleeping in them
+                self.flood_wait_until = self.clock.time() + fl.value + 3
+                self.log.warning("<light-yellow>{}</light-yellow> | FloodWait {}", self.session_name, fl)
+                raise TelegramFloodWait(fl.value + 3)
+
+            app = InputBotAppShortName(bot_id=peer, short_name="app")
             if settings.REF_ID == '':
                 start_param = '737844465'
             else:
                 start_param = settings.REF_ID
-            web_view = await self.tg_client.invoke(RequestAppWebView(
+            web_view = await tg_client.invoke(RequestAppWebView(
                 peer=peer,
                 app=app,
                 platform='android',
@@ -81,352 +147,262 @@ class Tapper:
             tg_web_data = unquote(
                 string=auth_url.split('tgWebAppData=', maxsplit=1)[1].split('&tgWebAppVersion', maxsplit=1)[0])
 
-            if with_tg is False:
-                await self.tg_client.disconnect()
+            web_data_cache.store(self.session_name, tg_web_data)
 
             return tg_web_data
 
-        except InvalidSession as error:
+        except (InvalidSession, TelegramFloodWait) as error:
             raise error
 
         except Exception as error:
-            logger.error(f"<light-yellow>{self.session_name}</light-yellow> | Unknown error during Authorization: "
-                         f"{error}")
-            await asyncio.sleep(delay=3)
+            self.log.error("<light-yellow>{}</light-yellow> | Unknown error during Authorization: {}",
+                           self.session_name, error)
+
+        finally:
+            await self.release_tg_client(tg_client)
+
+    @staticmethod
+    async def release_tg_client(tg_client: 'Client') -> None:
+        if tg_client.is_connected:
+            await tg_client.disconnect()
+        elif tg_client.storage.conn is not None:
+            await tg_client.storage.close()
+
+    async def sync_clicks(self) -> tuple[bool, int] | None:
+        random_clicks = randint(settings.CLICKS[0], settings.CLICKS[1])
+        if await self.api.claim_taps(amount=random_clicks):
+            return (True,
+                    random_clicks)
+
+    def record_user(self, user: User) -> None:
+        self.state.balance = float(user.balance)
+        if user.limitDate:
+            self.state.limit_date = datetime.fromisoformat(user.limitDate.replace("Z", "+00:00")).timestamp()
+        else:
+            self.state.limit_date = 0
+        self.state.completed_quests = [sys.intern(quest.name) for quest in user.quests
+                                       if quest.status == 'completed']
 
-    async def user(self, http_client: aiohttp.ClientSession):
-        try:
-            await http_client.post(url='https://api.diamore.co/user/visit')
-            response = await http_client.get(url='https://api.diamore.co/user')
-            response.raise_for_status()
-            response_text = await response.text()
-            app_user_data = json.loads(response_text)
-            return app_user_data
-        except Exception as error:
-            logger.error(f"Auth request error happened: {error}")
+    async def upgrade(self, upgrades: Upgrades | None = None, balance: int | None = None) -> None:
+        failed = False
+
+        while True:
+            if balance is None:
+                upgrades, user = await asyncio.gather(self.api.get_upgrades(), self.api.user())
+                if upgrades is None or user is None:
+                    return
+                balance = user.balance_int
+            elif upgrades is None:
+                upgrades = await self.api.get_upgrades()
+                if upgrades is None:
+                    return
+
+            for upgrade_type in UPGRADE_NAMES:
+                levels = getattr(upgrades, upgrade_type)
+                if levels:
+                    self.state.upgrade_levels[upgrade_type] = levels[0].level
+
+            plan = plan_upgrades(upgrades=upgrades, balance=balance, targets=upgrade_targets())
+
+            for step in plan.steps:
+                status = await self.api.buy_upgrade(type=step.type)
+                if not status:
+                    self.log.error("<light-yellow>{}</light-yellow> | Something wrong in upgrade", self.session_name)
+                    break
+
+                balance -= step.price
+                self.state.balance = balance
+                self.state.upgrade_levels[step.type] = step.level
+                self.log.success("<light-yellow>{}</light-yellow> | Successfully upgraded {}, level - {}, balance - {}",
+                                 self.session_name, UPGRADE_NAMES[step.type], step.level, balance)
+            else:
+                for upgrade_type in plan.not_enough_money:
+                    self.log.info("<light-yellow>{}</light-yellow> | Not enough money to upgrade {}", self.session_name,
+                                  UPGRADE_NAMES[upgrade_type])
+
+                if not plan.needs_resync:
+                    return
+                upgrades = None
+                continue
+
+            if failed:
+                return
+            failed = True
+            upgrades = balance = None
+
+    async def watch_ads(self, ads_count: int) -> None:
+        watched = played = earned = 0
+        for _ in range(ads_count):
+            if not await self.api.watch_ad():
+                break
+            watched += 1
+
+            result = await self.sync_clicks()
+            if result:
+                played += 1
+                earned += result[1]
+
+        self.state.balance += earned
+        if watched:
+            self.log.success("<light-yellow>{}</light-yellow> | Watched {}/{} ads, played {} games, got - {} diamonds, "
+                             "balance - {}", self.session_name, watched, ads_count, played, earned,
+                             int(self.state.balance))
+
+    async def refresh_tg_web_data(self) -> str | None:
+        # The API client lives for one cycle, the guard has to outlive it or every cycle logs in again
+        if self.clock.time() - self.auth_refreshed_at < AUTH_REFRESH_INTERVAL:
             return None
 
-    async def claim_daily(self, http_client: aiohttp.ClientSession):
+        self.auth_refreshed_at = self.clock.time()
+        self.log.info("<light-yellow>{}</light-yellow> | Auth data rejected, logging in again", self.session_name)
+        web_data_cache.drop(self.session_name)
         try:
-            response = await http_client.post(url='https://api.diamore.co/daily/claim')
-            if response.status in [200, 201]:
-                return True
-            return False
-        except Exception as error:
-            logger.error(f"Daily claim error happened: {error}")
+            return await self.get_tg_web_data(proxy=self.proxy)
+        except TelegramFloodWait:
+            # The next cycle finds the cache empty and waits out the FloodWait from open_api
             return None
 
-    async def get_quests(self, http_client: aiohttp.ClientSession):
-        try:
-            response = await http_client.get(url='https://api.diamore.co/quests')
-            response_text = await response.text()
-            data = json.loads(response_text)
-            quests_with_timer = []
-            for quest in data:
-                if quest.get('checkType') == 'timer':
-                    quests_with_timer.append(quest['name'])
-            return quests_with_timer
+    async def setup(self) -> None:
+        if not proxy_health.is_alive(self.proxy):
+            raise ConnectionError(f"proxy {proxy_label(self.proxy)} is down")
 
-        except Exception as error:
-            logger.error(f"Get quests error happened: {error}")
+        if not await self.get_tg_web_data(proxy=self.proxy):
+            raise ConnectionError("no Telegram web app data")
+
+    async def open_api(self) -> DiamoreApi | None:
+        tg_web_data = await self.get_tg_web_data(proxy=self.proxy)
+        if not tg_web_data:
             return None
 
-    async def finish_quests(self, http_client: aiohttp.ClientSession, quest_name: str):
-        try:
-            response = await http_client.post(url='https://api.diamore.co/quests/finish',
-                                              json={"questName": f'{quest_name}'})
-            response_text = await response.text()
-            data = json.loads(response_text)
-            if data.get('message') == 'Quest marked as finished':
-                return True
+        api = DiamoreApi(proxy=self.proxy, session_name=self.session_name)
+        api.reauthorize = self.refresh_tg_web_data
+        api.authorize(tg_web_data=tg_web_data, user_agent=self.user_agent)
+        return api
 
-        except Exception as error:
-            logger.error(f"Finish quests error happened: {error}")
-            return None
+    async def close(self) -> None:
+        self.bound_log = None
+        if self.api is not None:
+            await self.api.close()
+            self.api = None
 
-    async def sync_clicks(self, http_client: aiohttp.ClientSession):
-        try:
-            random_clicks = randint(settings.CLICKS[0], settings.CLICKS[1])
-            response = await http_client.post(url='https://api.diamore.co/taps/claim',
-                                              json={"amount": str(random_clicks)})
-            response_text = await response.text()
-            data = json.loads(response_text)
-            if data.get('message') == 'Taps claimed':
-                return (True,
-                        random_clicks)
+    @staticmethod
+    async def skip_rewards() -> None:
+        return None
 
-        except Exception as error:
-            logger.error(f"Sync clicks error happened: {error}")
-            return None
+    async def fetch_snapshot(self) -> tuple:
+        rewards = self.api.get_rewards() if self.clock.time() >= self.state.daily_next_claim else self.skip_rewards()
+        reads = [self.api.user(), rewards, quest_catalog.get(self.api), self.api.get_ads_limit()]
+        if upgrade_targets():
+            reads.append(self.api.get_upgrades())
 
-    async def get_ads_limit(self, http_client: aiohttp.ClientSession):
-        try:
-            response = await http_client.get(url='https://api.diamore.co/ads')
-            resp_json = await response.json()
-            return resp_json.get('available')
-        except Exception as error:
-            logger.error(f"Get ads limit error happened: {error}")
-            return 0
+        user, rewards, quests, ads_count, *upgrades = await asyncio.gather(*reads)
+        return user, rewards, quests, ads_count, upgrades[0] if upgrades else None
+
+    async def run_cycle(self) -> float:
+        if not proxy_health.is_alive(self.proxy):
+            self.log.warning("<light-yellow>{}</light-yellow> | Proxy {} is down, retry in {}s", self.session_name,
+                             proxy_label(self.proxy), settings.PROXY_CHECK_TTL)
+            return settings.PROXY_CHECK_TTL
 
-    async def get_upgrades(self, http_client: aiohttp.ClientSession):
         try:
-            response = await http_client.get(url='https://api.diamore.co/upgrades')
-            resp_json = await response.json()
-            current_tap_power = resp_json['tapPower'][0]
-            future_tap_power = resp_json['tapPower'][1]
-
-            current_tap_duration = resp_json['tapDuration'][0]
-            future_tap_duration = resp_json['tapDuration'][1]
-
-            current_tap_cooldown = resp_json['tapCoolDown'][0]
-            future_tap_cooldown = resp_json['tapCoolDown'][1]
-            return (current_tap_power, future_tap_power, current_tap_duration, future_tap_duration,
-                    current_tap_cooldown, future_tap_cooldown)
-        except Exception as error:
-            logger.error(f"Get upgrades error happened: {error}")
-            return None
+            self.api = await self.open_api()
+        except TelegramFloodWait as error:
+            self.log.info("<light-yellow>{}</light-yellow> | Sleep {}s", self.session_name, round(error.seconds))
+            return error.seconds
+
+        if self.api is None:
+            # A session that keeps failing to log in is retried with the scheduler's growing delay
+            raise ConnectionError("no Telegram web app data")
 
-    async def do_upgrade(self, http_client: aiohttp.ClientSession, type: str):
         try:
-            response = await http_client.post(url='https://api.diamore.co/upgrades/buy', json={"type": type})
-            resp_json = await response.json()
-            if resp_json.get('message') == 'Your level has been raised!':
-                return True
+            return await self.play_cycle()
+        finally:
+            await self.close()
+
+    async def play_cycle(self) -> float:
+        user, rewards, quests, ads_count, upgrades = await self.fetch_snapshot()
+        if user is None:
+            delay = retry_after('user')
+            state = 'degraded' if is_degraded() else 'unavailable'
+            self.log.warning("<light-yellow>{}</light-yellow> | API {}, retry in {}s", self.session_name, state,
+                             round(delay))
+            return delay
+
+        self.record_user(user)
+        self.log.info("<light-yellow>{}</light-yellow> | Balance - {}", self.session_name, user.balance_int)
+
+        if rewards and str(rewards.current) != "0":
+            claim_daily = await self.api.claim_daily()
+            if claim_daily:
+                self.state.daily_claimed_at = self.clock.time()
+                self.state.daily_next_claim = next_daily_check(self.state.daily_claimed_at, self.clock.time())
+                self.log.info("<light-yellow>{}</light-yellow> | Claimed daily", self.session_name)
+        elif rewards:
+            self.state.daily_next_claim = next_daily_check(self.state.daily_claimed_at, self.clock.time())
+            log_summary.add(self.log, self.session_name, 'Daily bonus not available')
+
+        new_quests = quests - set(self.state.completed_quests) if quests else ()
+        for quest_name in sorted(new_quests):
+            status = await self.api.finish_quest(quest_name=quest_name)
+            if status is True:
+                self.state.completed_quests.append(quest_name)
+                self.log.info("<light-yellow>{}</light-yellow> | Successfully done {} quest", self.session_name,
+                              quest_name)
+
+        limit_date_str = user.limitDate
+        if limit_date_str or limit_date_str is None:
+            if limit_date_str:
+                limit_date = datetime.fromisoformat(limit_date_str.replace("Z", "+00:00"))
             else:
-                return False
-        except Exception as error:
-            logger.error(f"Do upgrade error happened: {error}")
-            return False
+                limit_date = datetime.min.replace(tzinfo=timezone.utc)
 
-    async def watch_ad(self, http_client: aiohttp.ClientSession):
-        try:
-            response = await http_client.post(url='https://api.diamore.co/ads/watch', json={"type": "adsgram"})
-            resp_json = await response.json()
-            if resp_json.get('message') == 'Ad bonus applied!':
-                return True
-        except Exception as error:
-            logger.error(f"Watch ads error happened: {error}")
-            return None
+            current_time_utc = self.clock.now()
 
-    async def get_rewards(self, http_client: aiohttp.ClientSession):
-        try:
-            response = await http_client.get(url='https://api.diamore.co/daily/rewards')
-            resp_json = await response.json()
-            return resp_json
-        except Exception as error:
-            logger.error(f'Get rewards error happened: {error}')
+            if current_time_utc > limit_date:
+                status, clicks = await self.sync_clicks() or (False, 0)
+                if status is True:
+                    self.state.balance += clicks
+                    self.log.success("<light-yellow>{}</light-yellow> | Played game, got - {} diamonds, balance - {}",
+                                     self.session_name, clicks, int(self.state.balance))
+            else:
+                log_summary.add(self.log, self.session_name, 'Game on cooldown')
 
-    async def check_proxy(self, http_client: aiohttp.ClientSession, proxy: Proxy) -> None:
-        try:
-            response = await http_client.get(url='https://httpbin.org/ip', timeout=aiohttp.ClientTimeout(5))
-            ip = (await response.json()).get('origin')
-            logger.info(f"<light-yellow>{self.session_name}</light-yellow> | Proxy IP: {ip}")
-        except Exception as error:
-            logger.error(f"<light-yellow>{self.session_name}</light-yellow> | Proxy: {proxy} | Error: {error}")
+        if ads_count:
+            await self.watch_ads(ads_count)
 
-    async def run(self, proxy: str | None) -> None:
-        proxy_conn = ProxyConnector().from_url(proxy) if proxy else None
+        # /user is memoized and dropped by every write, so this only hits the API when the cycle claimed
+        # something, and then brings the limitDate of the game just played
+        user = await self.api.user() or user
+        self.record_user(user)
 
-        http_client = CloudflareScraper(headers=headers, connector=proxy_conn)
+        if upgrades is not None:
+            await self.upgrade(upgrades=upgrades, balance=int(self.state.balance))
 
-        if proxy:
-            await self.check_proxy(http_client=http_client, proxy=proxy)
+        next_tap_delay = self.state.limit_date - self.clock.time()
+        if next_tap_delay <= 0 or next_tap_delay > 3600:
+            sleep_time = randint(3500, 3600)
+        else:
+            sleep_time = next_tap_delay + 1
 
-        tg_web_data = await self.get_tg_web_data(proxy=proxy)
+        self.state.next_wake = self.clock.time() + sleep_time
+        state_store.save(self.state)
 
-        http_client.headers["User-Agent"] = generate_random_user_agent(device_type='android', browser_type='chrome')
-        http_client.headers['Authorization'] = f'Token {tg_web_data}'
+        log_summary.add(self.log, self.session_name, 'Sleep', f' {round(sleep_time / 60, 2)} min')
+        return sleep_time
 
-        while True:
-            try:
-                user = await self.user(http_client=http_client)
-                if user is None:
-                    continue
-
-                logger.info(
-                    f'<light-yellow>{self.session_name}</light-yellow> | Balance - {int(float(user["balance"]))}')
-
-                await asyncio.sleep(1.5)
-
-                rewards = await self.get_rewards(http_client)
-                if rewards.get('current') != "0":
-                    claim_daily = await self.claim_daily(http_client=http_client)
-                    if claim_daily:
-                        logger.info(f'<light-yellow>{self.session_name}</light-yellow> | Claimed daily')
-                else:
-                    logger.info(f'<light-yellow>{self.session_name}</light-yellow> | Daily bonus not available')
-
-                await asyncio.sleep(1.5)
-
-                if not user['quests']:
-                    quests = await self.get_quests(http_client=http_client)
-                    for quest_name in quests:
-                        status = await self.finish_quests(http_client=http_client, quest_name=quest_name)
-                        if status is True:
-                            logger.info(f'<light-yellow>{self.session_name}</light-yellow> | Successfully done '
-                                        f'{quest_name} quest')
-                elif user['quests']:
-                    quests = await self.get_quests(http_client=http_client)
-                    completed_quests = []
-                    new_quests = []
-                    for quest in user['quests']:
-                        if quest['status'] == 'completed':
-                            completed_quests.append(quest['name'])
-                    for quest_name in quests:
-                        if quest_name not in completed_quests:
-                            new_quests.append(quest_name)
-                    for quest_name in new_quests:
-                        status = await self.finish_quests(http_client=http_client, quest_name=quest_name)
-                        if status is True:
-                            logger.info(f'<light-yellow>{self.session_name}</light-yellow> | Successfully done '
-                                        f'{quest_name} quest')
-
-                await asyncio.sleep(1.5)
-                next_tap_delay = None
-                limit_date_str = user.get("limitDate")
-                if limit_date_str or limit_date_str is None:
-                    if limit_date_str:
-                        limit_date = datetime.fromisoformat(limit_date_str.replace("Z", "+00:00"))
-                    else:
-                        limit_date = datetime.min.replace(tzinfo=timezone.utc)
-
-                    current_time_utc = datetime.now(pytz.utc)
-
-                    if current_time_utc > limit_date:
-                        status, clicks = await self.sync_clicks(http_client=http_client)
-                        if status is True:
-                            user = await self.user(http_client=http_client)
-                            logger.success(f'<light-yellow>{self.session_name}</light-yellow> | Played game, got - '
-                                           f'{clicks} diamonds, balance - {int(float(user["balance"]))}')
-                    else:
-                        logger.info(f'<light-yellow>{self.session_name}</light-yellow> | Game on cooldown')
-                        next_tap_delay = limit_date - current_time_utc
-
-                await asyncio.sleep(1.5)
-
-                ads_count = await self.get_ads_limit(http_client)
-                if ads_count:
-                    while ads_count > 0:
-                        status = await self.watch_ad(http_client)
-                        if status:
-                            logger.success(
-                                f'<light-yellow>{self.session_name}</light-yellow> | Watched ad to skip game '
-                                f'cooldown')
-                            status, clicks = await self.sync_clicks(http_client=http_client)
-                            user = await self.user(http_client=http_client)
-                            logger.success(f'<light-yellow>{self.session_name}</light-yellow> | Played game, got - '
-                                           f'{clicks} diamonds, balance - {int(float(user["balance"]))}')
-                        ads_count -= 1
-
-                if settings.AUTO_UPGRADE_REDUCE_COOLDOWN:
-                    while True:
-                        (current_tap_power, future_tap_power, current_tap_duration, future_tap_duration,
-                         current_tap_cooldown, future_tap_cooldown) = await self.get_upgrades(http_client)
-                        user = await self.user(http_client=http_client)
-                        if user is None:
-                            continue
-
-                        balance = int(float(user["balance"]))
-                        level = current_tap_cooldown.get('level')
-                        price = int(float(current_tap_cooldown.get('price')))
-
-                        if level >= settings.AUTO_UPGRADE_REDUCE_COOLDOWN_LEVEL:
-                            break
-                        else:
-                            if balance >= price:
-                                status = await self.do_upgrade(http_client=http_client, type="tapCoolDown")
-                                if status:
-                                    logger.success(f'<light-yellow>{self.session_name}</light-yellow> | Successfully '
-                                                   f'upgraded game cooldown, level - {level+1}, balance - {balance-price}')
-                                else:
-                                    logger.error(f'<light-yellow>{self.session_name}</light-yellow> | Something wrong '
-                                                 f'in upgrade')
-                                    break
-                            else:
-                                logger.info(f'<light-yellow>{self.session_name}</light-yellow> | Not enough money to up'
-                                            f'grade game cooldown')
-                                break
-
-
-
-                if settings.AUTO_UPGRADE_CLICKING_POWER:
-                    while True:
-                        (current_tap_power, future_tap_power, current_tap_duration, future_tap_duration,
-                         current_tap_cooldown, future_tap_cooldown) = await self.get_upgrades(http_client)
-                        user = await self.user(http_client=http_client)
-                        if user is None:
-                            continue
-
-                        balance = int(float(user["balance"]))
-
-                        level = current_tap_power.get('level')
-                        price = int(float(current_tap_power.get('price')))
-
-                        if level >= settings.AUTO_UPGRADE_CLICKING_POWER_LEVEL:
-                            break
-                        else:
-                            if balance >= price:
-                                status = await self.do_upgrade(http_client=http_client, type="tapPower")
-                                if status:
-                                    logger.success(f'<light-yellow>{self.session_name}</light-yellow> | Successfully '
-                                                   f'upgraded game tap power, level - {level+1}, balance - {balance-price}')
-                                else:
-                                    logger.error(f'<light-yellow>{self.session_name}</light-yellow> | Something wrong '
-                                                 f'in upgrade')
-                                    break
-                            else:
-                                logger.info(f'<light-yellow>{self.session_name}</light-yellow> | Not enough money to up'
-                                            f'grade game tap power')
-                                break
-
-                if settings.AUTO_UPGRADE_TIMER:
-                    while True:
-                        (current_tap_power, future_tap_power, current_tap_duration, future_tap_duration,
-                         current_tap_cooldown, future_tap_cooldown) = await self.get_upgrades(http_client)
-                        user = await self.user(http_client=http_client)
-                        if user is None:
-                            continue
-
-                        balance = int(float(user["balance"]))
-
-                        level = current_tap_duration.get('level')
-                        price = int(float(current_tap_duration.get('price')))
-
-                        if level >= settings.AUTO_UPGRADE_TIMER_LEVEL:
-                            break
-                        else:
-                            if balance >= price:
-                                status = await self.do_upgrade(http_client=http_client, type="tapDuration")
-                                if status:
-                                    logger.success(f'<light-yellow>{self.session_name}</light-yellow> | Successfully '
-                                                   f'upgraded game duration, level - {level+1}, balance - {balance-price}')
-                                else:
-                                    logger.error(f'<light-yellow>{self.session_name}</light-yellow> | Something wrong '
-                                                 f'in upgrade')
-                                    break
-                            else:
-                                logger.info(f'<light-yellow>{self.session_name}</light-yellow> | Not enough money to up'
-                                            f'grade game duration')
-                                break
-
-                if next_tap_delay is None or next_tap_delay.seconds > 3600:
-                    sleep_time = randint(3500, 3600)
-                else:
-                    sleep_time = next_tap_delay.seconds
-
-                logger.info(f'<light-yellow>{self.session_name}</light-yellow> | Sleep {round(sleep_time / 60, 2)} min')
-                await asyncio.sleep(sleep_time)
-
-            except InvalidSession as error:
-                raise error
-
-            except Exception as error:
-                logger.error(f"<light-yellow>{self.session_name}</light-yellow> | Unknown error: {error}")
-                await asyncio.sleep(delay=3)
-
-
-async def run_tapper(tg_client: Client, proxy: str | None):
-    try:
-        await Tapper(tg_client=tg_client).run(proxy=proxy)
-    except InvalidSession:
-        logger.error(f"{tg_client.name} | Invalid Session")
+    async def run(self) -> None:
+        # Production accounts are driven by Scheduler, this loop only runs benchmarks/simulate.py on its virtual
+        # clock, which Scheduler's loop-time deadlines cannot follow
+        try:
+            while True:
+                try:
+                    await self.setup()
+                    break
+                except TelegramFloodWait as error:
+                    await self.clock.sleep(error.seconds)
+
+            while True:
+                sleep_time = await self.run_cycle()
+                await self.clock.sleep(sleep_time)
+        finally:
+            await self.close()
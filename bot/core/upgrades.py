@@ -0,0 +1,70 @@
+from dataclasses import dataclass, field
+
+from bot.config import settings
+from .models import Upgrades
+
+
+UPGRADE_NAMES = {
+    'tapCoolDown': 'game cooldown',
+    'tapPower': 'game tap power',
+    'tapDuration': 'game duration',
+}
+
+
+@dataclass(slots=True)
+class PlannedUpgrade:
+    type: str
+    level: int
+    price: int
+
+
+@dataclass(slots=True)
+class UpgradePlan:
+    steps: list[PlannedUpgrade] = field(default_factory=list)
+    not_enough_money: list[str] = field(default_factory=list)
+    needs_resync: bool = False
+    balance: int = 0
+
+
+def upgrade_targets() -> list[tuple[str, int]]:
+    targets = []
+    if settings.AUTO_UPGRADE_REDUCE_COOLDOWN:
+        targets.append(('tapCoolDown', settings.AUTO_UPGRADE_REDUCE_COOLDOWN_LEVEL))
+    if settings.AUTO_UPGRADE_CLICKING_POWER:
+        targets.append(('tapPower', settings.AUTO_UPGRADE_CLICKING_POWER_LEVEL))
+    if settings.AUTO_UPGRADE_TIMER:
+        targets.append(('tapDuration', settings.AUTO_UPGRADE_TIMER_LEVEL))
+    return targets
+
+
+def plan_upgrades(upgrades: Upgrades, balance: int, targets: list[tuple[str, int]]) -> UpgradePlan:
+    # /upgrades only lists the current level and the next one for every type, so the plan covers at most two
+    # purchases per type. When both are bought and the target level is still not reached, the plan stops there
+    # and asks for a fresh snapshot, which keeps the original cooldown -> power -> duration priority.
+    plan = UpgradePlan(balance=balance)
+
+    for upgrade_type, max_level in targets:
+        steps = getattr(upgrades, upgrade_type) or []
+        reached = False
+
+        for step in steps:
+            level = step.level
+            price = int(float(step.price))
+
+            if level >= max_level:
+                reached = True
+                break
+
+            if plan.balance < price:
+                plan.not_enough_money.append(upgrade_type)
+                reached = True
+                break
+
+            plan.steps.append(PlannedUpgrade(type=upgrade_type, level=level + 1, price=price))
+            plan.balance -= price
+
+        if not reached and steps:
+            plan.needs_resync = True
+            break
+
+    return plan
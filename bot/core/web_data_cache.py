@@ -0,0 +1,55 @@
+import os
+import json
+import time
+from urllib.parse import parse_qs
+
+from bot.config import settings
+
+
+CACHE_DIR = "sessions/web_data"
+
+
+def parse_auth_date(tg_web_data: str) -> int:
+    try:
+        return int(parse_qs(tg_web_data).get('auth_date', ['0'])[0])
+    except ValueError:
+        return 0
+
+
+def _path(session_name: str) -> str:
+    return os.path.join(CACHE_DIR, f"{session_name}.json")
+
+
+def load(session_name: str) -> str | None:
+    try:
+        with open(_path(session_name), encoding="utf-8") as file:
+            entry = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    expires_at = entry.get('auth_date', 0) + settings.TG_WEB_DATA_TTL - settings.TG_WEB_DATA_REFRESH_MARGIN
+    if time.time() >= expires_at:
+        return None
+
+    return entry.get('tg_web_data')
+
+
+def store(session_name: str, tg_web_data: str) -> None:
+    os.makedirs(CACHE_DIR, exist_ok=True)
+
+    entry = {
+        'tg_web_data': tg_web_data,
+        'auth_date': parse_auth_date(tg_web_data),
+    }
+
+    tmp_path = f"{_path(session_name)}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(entry, file)
+    os.replace(tmp_path, _path(session_name))
+
+
+def drop(session_name: str) -> None:
+    try:
+        os.remove(_path(session_name))
+    except FileNotFoundError:
+        pass
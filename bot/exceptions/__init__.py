@@ -1,2 +1,8 @@
 class InvalidSession(BaseException):
     ...
+
+
+class TelegramFloodWait(Exception):
+    def __init__(self, seconds: float):
+        super().__init__(f"Telegram FloodWait, retry in {round(seconds)}s")
+        self.seconds = seconds
@@ -1,5 +1,4 @@
 from .logger import logger
-from . import launcher
 
 
 import os
@@ -0,0 +1,17 @@
+import time
+import asyncio
+from datetime import datetime, timezone
+
+
+class Clock:
+    def time(self) -> float:
+        return time.time()
+
+    def now(self) -> datetime:
+        return datetime.fromtimestamp(self.time(), timezone.utc)
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(seconds)
+
+
+system_clock = Clock()
@@ -4,13 +4,10 @@ import asyncio
 import argparse
 from itertools import cycle
 
-from pyrogram import Client
 from better_proxy import Proxy
 
 from bot.config import settings
 from bot.utils import logger
-from bot.core.tapper import run_tapper
-from bot.core.registrator import register_sessions
 
 
 start_text = """
@@ -32,8 +29,6 @@ Select an action:
     2. Create session
 """
 
-global tg_clients
-
 def get_session_names() -> list[str]:
     session_names = glob.glob("sessions/*.session")
     session_names = [
@@ -53,38 +48,47 @@ def get_proxies() -> list[Proxy]:
     return proxies
 
 
-async def get_tg_clients() -> list[Client]:
-    global tg_clients
+async def check_proxies() -> None:
+    from bot.core.proxy_health import proxy_health
+    from bot.utils.metrics import proxy_label
+
+    proxies = get_proxies()
+    if not proxies:
+        return
+
+    statuses = await proxy_health.check(proxies)
+    dead = [proxy for proxy, status in statuses.items() if not status.alive]
+    logger.info(f"Checked {len(statuses)} proxies | {len(statuses) - len(dead)} alive, {len(dead)} dead")
+    for proxy in dead:
+        logger.warning(f"Skipping dead proxy {proxy_label(proxy)} | {statuses[proxy].error}")
+
+
+def assign_proxies(session_names: list[str]) -> list[str | None]:
+    from bot.core.proxy_health import proxy_health
 
-    session_names = get_session_names()
+    proxies = get_proxies()
+    alive = [proxy for proxy in proxies if proxy_health.is_alive(proxy)]
+    if proxies and not alive:
+        logger.warning("All proxies failed the health check, assigning them anyway")
+    else:
+        proxies = alive
+    proxies_cycle = cycle(proxies) if proxies else None
 
+    return [next(proxies_cycle) if proxies_cycle else None for _ in session_names]
+
+
+def check_sessions(session_names: list[str]) -> None:
     if not session_names:
         raise FileNotFoundError("Not found session files")
 
     if not settings.API_ID or not settings.API_HASH:
         raise ValueError("API_ID and API_HASH not found in the .env file.")
 
-    tg_clients = [
-        Client(
-            name=session_name,
-            api_id=settings.API_ID,
-            api_hash=settings.API_HASH,
-            workdir="sessions/",
-            plugins=dict(root="bot/plugins"),
-        )
-        for session_name in session_names
-    ]
-
-    return tg_clients
-
-
-async def process() -> None:
-    parser = argparse.ArgumentParser()
-    parser.add_argument("-a", "--action", type=int, help="Action to perform")
 
+async def process(args: argparse.Namespace) -> None:
     logger.info(f"Detected {len(get_session_names())} sessions | {len(get_proxies())} proxies")
 
-    action = parser.parse_args().action
+    action = args.action
 
     if not action:
         print(start_text)
@@ -101,24 +105,67 @@ async def process() -> None:
                 break
 
     if action == 2:
-        await register_sessions()
-    elif action == 1:
-        tg_clients = await get_tg_clients()
-
-        await run_tasks(tg_clients=tg_clients)
+        from bot.core.registrator import register_sessions
 
+        await register_sessions()
+    elif action == 1 and args.workers > 1:
+        from bot.utils.workers import run_workers
 
-async def run_tasks(tg_clients: list[Client]):
-    proxies = get_proxies()
-    proxies_cycle = cycle(proxies) if proxies else None
-    tasks = [
-        asyncio.create_task(
-            run_tapper(
-                tg_client=tg_client,
-                proxy=next(proxies_cycle) if proxies_cycle else None,
-            )
+        await run_workers(workers=args.workers, profile=args.profile)
+    elif action == 1:
+        session_names = get_session_names()
+        check_sessions(session_names)
+
+        await run_tasks(session_names=session_names, profile=args.profile)
+
+
+async def run_tasks(session_names: list[str], proxies: list[str | None] | None = None, profile: str | None = None):
+    # The clicker stack pulls in aiohttp, aiocfscrape and Pyrogram, keep it out of "Create session" and --help
+    from bot.core.api import connector_pool
+    from bot.core.proxy_health import proxy_health
+    from bot.core.scheduler import Scheduler
+    from bot.core.state import state_store
+    from bot.core.tapper import Tapper
+    from bot.utils.loop_lag import LoopLagMonitor
+    from bot.utils.metrics import start_exporter
+    from bot.utils.profiler import profiler
+
+    if proxies is None:
+        await check_proxies()
+        proxies = assign_proxies(session_names)
+
+    states = state_store.load_all()
+    tappers = [
+        Tapper(
+            session_name=session_name,
+            proxy=proxy,
+            state=states.get(session_name),
         )
-        for tg_client in tg_clients
+        for session_name, proxy in zip(session_names, proxies)
     ]
 
-    await asyncio.gather(*tasks)
+    exporter = None
+    if settings.METRICS_PORT:
+        exporter = await start_exporter(host=settings.METRICS_HOST, port=settings.METRICS_PORT)
+        logger.info(f"Metrics available at http://{settings.METRICS_HOST}:{settings.METRICS_PORT}/metrics")
+
+    if profile:
+        profiler.install()
+        logger.info(f"Profiling enabled, results will be written to {profile}")
+
+    monitor = LoopLagMonitor(threshold=settings.LOOP_LAG_WARNING)
+    monitor.start()
+    prober = asyncio.create_task(proxy_health.run(proxies))
+
+    try:
+        await Scheduler(workers=settings.MAX_CONCURRENT_CYCLES).run(tappers=tappers)
+    finally:
+        prober.cancel()
+        await monitor.stop()
+        await connector_pool.close()
+        state_store.close()
+        if exporter is not None:
+            await exporter.cleanup()
+        if profile:
+            profiler.dump(profile)
+            logger.info(f"Profile written to {profile}")
@@ -0,0 +1,36 @@
+import asyncio
+from collections import Counter
+
+from bot.config import settings
+from bot.utils.logger import logger
+
+
+class LogSummary:
+    def __init__(self, interval: float = settings.LOG_SUMMARY_INTERVAL):
+        self.interval = interval
+        self.counts: Counter[str] = Counter()
+
+    def add(self, log, session_name: str, event: str, detail: str = '') -> None:
+        if self.interval <= 0:
+            log.info("<light-yellow>{}</light-yellow> | {}{}", session_name, event, detail)
+            return
+        self.counts[event] += 1
+
+    def flush(self) -> None:
+        if not self.counts:
+            return
+        logger.info(" | ".join(f"{event} - {count} accounts" for event, count in self.counts.most_common()))
+        self.counts.clear()
+
+    async def run(self) -> None:
+        if self.interval <= 0:
+            return
+        try:
+            while True:
+                await asyncio.sleep(self.interval)
+                self.flush()
+        finally:
+            self.flush()
+
+
+log_summary = LogSummary()
@@ -1,10 +1,28 @@
 import sys
+import json
 from loguru import logger
 
+from bot.config import settings
+
+
+def json_sink(message) -> None:
+    record = message.record
+    extra = record["extra"]
+    text = record["message"]
+    if 'account' in extra:
+        text = text.removeprefix(f"{extra['account']} | ")
+
+    entry = {"time": record["time"].isoformat(), "level": record["level"].name, "message": text, **extra}
+    sys.stdout.write(json.dumps(entry, default=str) + "\n")
+
 
 logger.remove()
-logger.add(sink=sys.stdout, format="<white>{time:YYYY-MM-DD HH:mm:ss}</white>"
-                                   " | <level>{level: <8}</level>"
-                                   " | <cyan><b>{line}</b></cyan>"
-                                   " - <light-white><b>{message}</b></light-white>")
+if settings.LOG_FORMAT == 'json':
+    logger.add(sink=json_sink, level=settings.LOG_LEVEL, enqueue=settings.LOG_ENQUEUE, colorize=False)
+else:
+    logger.add(sink=sys.stdout, level=settings.LOG_LEVEL, enqueue=settings.LOG_ENQUEUE,
+               format="<white>{time:YYYY-MM-DD HH:mm:ss}</white>"
+                      " | <level>{level: <8}</level>"
+                      " | <cyan><b>{line}</b></cyan>"
+                      " - <light-white><b>{message}</b></light-white>")
 logger = logger.opt(colors=True)
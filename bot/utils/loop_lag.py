@@ -0,0 +1,57 @@
+import asyncio
+
+from bot.utils.logger import logger
+from bot.utils.metrics import metrics
+
+
+WARNING_INTERVAL = 10
+
+
+class LoopLagMonitor:
+    def __init__(self, interval: float = 0.1, threshold: float = 0):
+        self.interval = interval
+        self.threshold = threshold
+        self.samples: list[float] = []
+        self.max_lag = 0.0
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        warned_at = -WARNING_INTERVAL
+        delayed = 0
+        worst = 0.0
+
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            now = loop.time()
+            lag = max(0.0, now - started - self.interval)
+
+            self.samples.append(lag)
+            if len(self.samples) > 10_000:
+                del self.samples[:5_000]
+            self.max_lag = max(self.max_lag, lag)
+            metrics.loop_lag.observe(lag)
+
+            if self.threshold and lag > self.threshold:
+                delayed += 1
+                worst = max(worst, lag)
+                if now - warned_at >= WARNING_INTERVAL:
+                    logger.warning(f"Event loop lagging | {delayed} delays over {self.threshold}s, "
+                                   f"worst {worst:.3f}s")
+                    warned_at = now
+                    delayed = 0
+                    worst = 0.0
@@ -0,0 +1,178 @@
+import json
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+from aiohttp import web
+from yarl import URL
+
+
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class Histogram:
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        total = 0
+        result = []
+        for bound, count in zip((*BUCKETS, '+Inf'), self.counts):
+            total += count
+            result.append((str(bound), total))
+        return result
+
+
+def proxy_label(proxy: str | None) -> str:
+    if not proxy:
+        return 'direct'
+    url = URL(proxy)
+    return f'{url.host}:{url.port}'
+
+
+class Metrics:
+    def __init__(self):
+        self.requests: Counter[tuple[str, str]] = Counter()
+        self.latency: defaultdict[str, Histogram] = defaultdict(Histogram)
+        self.retries: Counter[str] = Counter()
+        self.proxy_requests: Counter[str] = Counter()
+        self.proxy_errors: Counter[str] = Counter()
+        self.proxy_latency: defaultdict[str, float] = defaultdict(float)
+        self.proxy_alive: dict[str, int] = {}
+        self.cycle_duration: dict[str, float] = {}
+        self.next_wake: dict[str, float] = {}
+        self.rate_limit_waiting: dict[str, int] = {}
+        self.loop_lag = Histogram()
+
+    def observe_request(self, endpoint: str, status: int | str, seconds: float, proxy: str | None = None) -> None:
+        self.requests[endpoint, str(status)] += 1
+        self.latency[endpoint].observe(seconds)
+
+        label = proxy_label(proxy)
+        self.proxy_requests[label] += 1
+        self.proxy_latency[label] += seconds
+        if status == 'error' or (isinstance(status, int) and status >= 500):
+            self.proxy_errors[label] += 1
+
+    def observe_retry(self, endpoint: str) -> None:
+        self.retries[endpoint] += 1
+
+    def observe_cycle(self, session_name: str, seconds: float, next_wake_in: float) -> None:
+        self.cycle_duration[session_name] = seconds
+        self.next_wake[session_name] = time.time() + next_wake_in
+
+    def to_dict(self) -> dict:
+        endpoints = {}
+        for (endpoint, status), count in self.requests.items():
+            entry = endpoints.setdefault(endpoint, {'count': 0, 'status': {}, 'retries': self.retries[endpoint]})
+            entry['count'] += count
+            entry['status'][status] = count
+        for endpoint, histogram in self.latency.items():
+            endpoints[endpoint]['latency'] = {
+                'sum': round(histogram.sum, 4),
+                'avg': round(histogram.sum / histogram.count, 4) if histogram.count else 0,
+                'buckets': dict(histogram.cumulative()),
+            }
+
+        proxies = {
+            label: {
+                'count': count,
+                'errors': self.proxy_errors[label],
+                'avg_latency': round(self.proxy_latency[label] / count, 4),
+            }
+            for label, count in self.proxy_requests.items()
+        }
+        for label, alive in self.proxy_alive.items():
+            proxies.setdefault(label, {})['alive'] = bool(alive)
+
+        accounts = {
+            session_name: {
+                'cycle_duration': round(seconds, 3),
+                'next_wake': round(self.next_wake.get(session_name, 0)),
+            }
+            for session_name, seconds in self.cycle_duration.items()
+        }
+
+        loop_lag = {
+            'avg': round(self.loop_lag.sum / self.loop_lag.count, 4) if self.loop_lag.count else 0,
+            'buckets': dict(self.loop_lag.cumulative()),
+        }
+
+        return {'endpoints': endpoints, 'proxies': proxies, 'accounts': accounts,
+                'rate_limit_waiting': dict(self.rate_limit_waiting), 'loop_lag': loop_lag}
+
+    def to_prometheus(self) -> str:
+        lines = ['# TYPE diamore_requests_total counter']
+        for (endpoint, status), count in sorted(self.requests.items()):
+            lines.append(f'diamore_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}')
+
+        lines.append('# TYPE diamore_request_retries_total counter')
+        for endpoint, count in sorted(self.retries.items()):
+            lines.append(f'diamore_request_retries_total{{endpoint="{endpoint}"}} {count}')
+
+        lines.append('# TYPE diamore_request_duration_seconds histogram')
+        for endpoint, histogram in sorted(self.latency.items()):
+            for bound, count in histogram.cumulative():
+                lines.append(f'diamore_request_duration_seconds_bucket{{endpoint="{endpoint}",le="{bound}"}} {count}')
+            lines.append(f'diamore_request_duration_seconds_sum{{endpoint="{endpoint}"}} {histogram.sum}')
+            lines.append(f'diamore_request_duration_seconds_count{{endpoint="{endpoint}"}} {histogram.count}')
+
+        lines.append('# TYPE diamore_proxy_requests_total counter')
+        for label, count in sorted(self.proxy_requests.items()):
+            lines.append(f'diamore_proxy_requests_total{{proxy="{label}"}} {count}')
+        lines.append('# TYPE diamore_proxy_errors_total counter')
+        for label, count in sorted(self.proxy_errors.items()):
+            lines.append(f'diamore_proxy_errors_total{{proxy="{label}"}} {count}')
+        lines.append('# TYPE diamore_proxy_up gauge')
+        for label, alive in sorted(self.proxy_alive.items()):
+            lines.append(f'diamore_proxy_up{{proxy="{label}"}} {alive}')
+
+        lines.append('# TYPE diamore_cycle_duration_seconds gauge')
+        for session_name, seconds in sorted(self.cycle_duration.items()):
+            lines.append(f'diamore_cycle_duration_seconds{{session="{session_name}"}} {seconds}')
+        lines.append('# TYPE diamore_next_wake_timestamp_seconds gauge')
+        for session_name, timestamp in sorted(self.next_wake.items()):
+            lines.append(f'diamore_next_wake_timestamp_seconds{{session="{session_name}"}} {timestamp}')
+
+        lines.append('# TYPE diamore_rate_limit_waiting gauge')
+        for bucket, waiting in sorted(self.rate_limit_waiting.items()):
+            lines.append(f'diamore_rate_limit_waiting{{bucket="{bucket}"}} {waiting}')
+
+        lines.append('# TYPE diamore_loop_lag_seconds histogram')
+        for bound, count in self.loop_lag.cumulative():
+            lines.append(f'diamore_loop_lag_seconds_bucket{{le="{bound}"}} {count}')
+        lines.append(f'diamore_loop_lag_seconds_sum {self.loop_lag.sum}')
+        lines.append(f'diamore_loop_lag_seconds_count {self.loop_lag.count}')
+
+        return '\n'.join(lines) + '\n'
+
+
+metrics = Metrics()
+
+
+async def _prometheus_handler(request: web.Request) -> web.Response:
+    return web.Response(text=metrics.to_prometheus(), content_type='text/plain')
+
+
+async def _json_handler(request: web.Request) -> web.Response:
+    return web.Response(text=json.dumps(metrics.to_dict()), content_type='application/json')
+
+
+async def start_exporter(host: str, port: int) -> web.AppRunner:
+    app = web.Application()
+    app.router.add_get('/metrics', _prometheus_handler)
+    app.router.add_get('/metrics.json', _json_handler)
+
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
@@ -0,0 +1,132 @@
+import json
+import time
+import functools
+from collections import defaultdict
+
+from loguru._logger import Logger
+
+
+class Stats:
+    __slots__ = ('calls', 'wall', 'wall_max', 'cpu')
+
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0
+        self.wall_max = 0.0
+        self.cpu = 0.0
+
+    def add(self, wall: float, cpu: float) -> None:
+        self.calls += 1
+        self.wall += wall
+        self.wall_max = max(self.wall_max, wall)
+        self.cpu += cpu
+
+
+class Timed:
+    """Awaits a coroutine and measures its wall time and the CPU time of its steps on the loop."""
+
+    def __init__(self, stats: Stats, coro):
+        self.stats = stats
+        self.coro = coro
+
+    def __await__(self):
+        coro = self.coro
+        started = time.perf_counter()
+        cpu = 0.0
+        value = error = None
+        try:
+            while True:
+                step = time.thread_time()
+                try:
+                    future = coro.throw(error) if error is not None else coro.send(value)
+                except StopIteration as stop:
+                    return stop.value
+                finally:
+                    cpu += time.thread_time() - step
+
+                value = error = None
+                try:
+                    value = yield future
+                except BaseException as exc:
+                    error = exc
+        finally:
+            self.stats.add(time.perf_counter() - started, cpu)
+
+
+class Profiler:
+    def __init__(self):
+        self.stats: defaultdict[str, Stats] = defaultdict(Stats)
+        self.started_at = 0.0
+        self._patched: list[tuple[object, str, object]] = []
+
+    def _patch(self, owner, name: str, wrapper) -> None:
+        self._patched.append((owner, name, owner.__dict__[name]))
+        setattr(owner, name, wrapper)
+
+    def instrument(self, owner, name: str, label: str | None = None) -> None:
+        func = getattr(owner, name)
+        stats = self.stats[label or f'{owner.__name__}.{name}']
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await Timed(stats, func(*args, **kwargs))
+
+        self._patch(owner, name, wrapper)
+
+    def instrument_sync(self, owner, name: str, label: str) -> None:
+        func = getattr(owner, name)
+        stats = self.stats[label]
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started, cpu = time.perf_counter(), time.thread_time()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stats.add(time.perf_counter() - started, time.thread_time() - cpu)
+
+        self._patch(owner, name, wrapper)
+
+    def install(self) -> None:
+        from bot.core.api import DiamoreApi
+        from bot.core.quests import QuestCatalog
+        from bot.core.tapper import Tapper
+
+        for name in ('user', 'get_rewards', 'claim_daily', 'get_quests', 'finish_quest', 'claim_taps',
+                     'get_ads_limit', 'watch_ad', 'get_upgrades', 'buy_upgrade'):
+            self.instrument(DiamoreApi, name)
+        for name in ('get_tg_web_data', 'request_tg_web_data', 'setup', 'run_cycle', 'fetch_snapshot', 'watch_ads',
+                     'upgrade'):
+            self.instrument(Tapper, name)
+        self.instrument(QuestCatalog, 'get')
+        self.instrument_sync(Logger, '_log', label='logging')
+
+        self.started_at = time.perf_counter()
+
+    def uninstall(self) -> None:
+        while self._patched:
+            owner, name, original = self._patched.pop()
+            setattr(owner, name, original)
+
+    def to_dict(self) -> dict:
+        functions = {
+            label: {
+                'calls': stats.calls,
+                'wall': round(stats.wall, 4),
+                'wall_avg': round(stats.wall / stats.calls, 4),
+                'wall_max': round(stats.wall_max, 4),
+                'cpu': round(stats.cpu, 4),
+            }
+            for label, stats in sorted(self.stats.items(), key=lambda item: item[1].cpu, reverse=True)
+            if stats.calls
+        }
+        return {'duration': round(time.perf_counter() - self.started_at, 2),
+                'cpu': round(time.process_time(), 2),
+                'functions': functions}
+
+    def dump(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+
+profiler = Profiler()
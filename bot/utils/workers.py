@@ -0,0 +1,150 @@
+import os
+import time
+import signal
+import asyncio
+import multiprocessing
+from queue import Empty
+
+from bot.config import settings
+from bot.utils import logger
+from bot.utils.metrics import metrics
+
+
+STATUS_INTERVAL = 10
+RESTART_DELAY = 5
+
+
+async def report_status(index: int, accounts: int, status_queue) -> None:
+    while True:
+        status_queue.put({
+            'worker': index,
+            'accounts': accounts,
+            'active': len(metrics.cycle_duration),
+            'requests': sum(metrics.requests.values()),
+        })
+        await asyncio.sleep(STATUS_INTERVAL)
+
+
+async def run_shard(index: int, session_names: list[str], proxies: list[str | None], status_queue,
+                    profile: str | None = None) -> None:
+    from bot.utils.launcher import run_tasks
+
+    if settings.METRICS_PORT:
+        settings.METRICS_PORT += index
+    if profile:
+        root, ext = os.path.splitext(profile)
+        profile = f"{root}-{index}{ext}"
+
+    reporter = asyncio.create_task(report_status(index=index, accounts=len(session_names), status_queue=status_queue))
+    try:
+        await run_tasks(session_names=session_names, proxies=proxies, profile=profile)
+    finally:
+        reporter.cancel()
+
+
+def _interrupt(signum, frame) -> None:
+    raise KeyboardInterrupt
+
+
+def worker_main(index: int, session_names: list[str], proxies: list[str | None], status_queue,
+                profile: str | None = None) -> None:
+    signal.signal(signal.SIGTERM, _interrupt)
+    try:
+        asyncio.run(run_shard(index=index, session_names=session_names, proxies=proxies, status_queue=status_queue,
+                              profile=profile))
+    except KeyboardInterrupt:
+        pass
+
+
+class Supervisor:
+    def __init__(self, workers: int, session_names: list[str], proxies: list[str | None],
+                 profile: str | None = None):
+        self.profile = profile
+        self.context = multiprocessing.get_context('spawn')
+        self.status_queue = self.context.Queue()
+        self.shards = [
+            (session_names[index::workers], proxies[index::workers])
+            for index in range(workers)
+        ]
+        self.shards = [shard for shard in self.shards if shard[0]]
+        self.processes: dict[int, multiprocessing.Process] = {}
+        self.restart_at: dict[int, float] = {}
+        self.restarts = 0
+        self.status: dict[int, dict] = {}
+
+    def start(self, index: int) -> None:
+        session_names, proxies = self.shards[index]
+        process = self.context.Process(target=worker_main, name=f"worker-{index}",
+                                       args=(index, session_names, proxies, self.status_queue, self.profile),
+                                       daemon=True)
+        process.start()
+        self.processes[index] = process
+        logger.info(f"Worker {index} started | pid {process.pid} | {len(session_names)} sessions")
+
+    def check(self) -> None:
+        now = time.monotonic()
+
+        for index, process in self.processes.items():
+            if process.is_alive() or index in self.restart_at:
+                continue
+
+            logger.error(f"Worker {index} exited with code {process.exitcode}, restarting in {RESTART_DELAY}s")
+            self.status.pop(index, None)
+            self.restart_at[index] = now + RESTART_DELAY
+
+        for index, restart_at in list(self.restart_at.items()):
+            if now >= restart_at:
+                del self.restart_at[index]
+                self.restarts += 1
+                self.start(index)
+
+    def collect(self) -> None:
+        while True:
+            try:
+                status = self.status_queue.get_nowait()
+            except Empty:
+                break
+            self.status[status['worker']] = status
+
+    def summary(self) -> str:
+        alive = sum(process.is_alive() for process in self.processes.values())
+        accounts = sum(status['accounts'] for status in self.status.values())
+        active = sum(status['active'] for status in self.status.values())
+        requests = sum(status['requests'] for status in self.status.values())
+        return (f"Workers {alive}/{len(self.shards)} alive | {active}/{accounts} accounts cycled | "
+                f"{requests} requests | {self.restarts} restarts")
+
+    def stop(self) -> None:
+        for process in self.processes.values():
+            if process.is_alive():
+                process.terminate()
+        for process in self.processes.values():
+            process.join(timeout=10)
+
+    async def run(self) -> None:
+        for index in range(len(self.shards)):
+            self.start(index)
+
+        last_summary = 0.0
+        try:
+            while True:
+                await asyncio.sleep(1)
+                self.collect()
+                self.check()
+
+                if time.monotonic() - last_summary >= STATUS_INTERVAL:
+                    last_summary = time.monotonic()
+                    logger.info(self.summary())
+        finally:
+            self.stop()
+
+
+async def run_workers(workers: int, profile: str | None = None) -> None:
+    from bot.utils.launcher import assign_proxies, check_proxies, check_sessions, get_session_names
+
+    session_names = get_session_names()
+    check_sessions(session_names)
+    await check_proxies()
+
+    await Supervisor(workers=workers, session_names=session_names, proxies=assign_proxies(session_names),
+                     profile=profile).run()
@@ -1,11 +1,25 @@
 import asyncio
+import argparse
 from contextlib import suppress
 
-from bot.utils.launcher import process
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-a", "--action", type=int, help="Action to perform")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Number of worker processes for the clicker")
+    parser.add_argument("--profile", nargs="?", const="profile.json", metavar="PATH",
+                        help="Record time spent per coroutine and write it to PATH on exit (default profile.json)")
+
+    return parser.parse_args()
 
 
 async def main():
-    await process()
+    args = parse_args()
+
+    # The launcher loads settings (pydantic-settings) and the logger, parse the arguments first so --help skips them
+    from bot.utils.launcher import process
+
+    await process(args)
 
 
 if __name__ == '__main__':